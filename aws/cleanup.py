@@ -6,6 +6,7 @@ import argparse
 import logging
 import os
 import sys
+import time
 import yaml
 
 import boto3
@@ -16,10 +17,12 @@ except ImportError:
     argcomplete = None
 
 from terminator import (
+    AWS_REGION,
     cleanup,
-    get_concrete_subclasses,
     logger,
-    Terminator,
+    metrics,
+    PURGE_BUDGET,
+    TERMINATORS,
 )
 
 
@@ -61,7 +64,13 @@ def main():
     if account_id != config['lambda_account_id']:
         sys.exit(f'The terminator must be run from the lambda account: {config["lambda_account_id"]}')
 
-    cleanup(args.stage, check=args.check, force=args.force, api_name=api_name, test_account_id=test_account_id, targets=args.target)
+    deadline = time.monotonic() + args.time_limit if args.time_limit else None
+
+    cleanup(args.stage, check=args.check, force=args.force, api_name=api_name, test_account_id=test_account_id, targets=args.target, jobs=args.jobs,
+            deadline=deadline, purge_budget=args.purge_budget, regions=args.region)
+
+    if args.verbose:
+        metrics.log_summary()
 
 
 def parse_args():
@@ -79,6 +88,26 @@ def parse_args():
                         action='store_true',
                         help='increase logging verbosity')
 
+    parser.add_argument('-j', '--jobs',
+                        type=int,
+                        default=1,
+                        help='number of resource types to process concurrently')
+
+    parser.add_argument('--purge-budget',
+                        type=int,
+                        default=PURGE_BUDGET,
+                        help='maximum number of stale database items to purge')
+
+    parser.add_argument('--region',
+                        metavar='region',
+                        action='append',
+                        help=f'region to clean up, may be repeated (default: {AWS_REGION})')
+
+    parser.add_argument('--time-limit',
+                        metavar='seconds',
+                        type=int,
+                        help='stop starting new resource types when the time limit is about to be reached')
+
     parser.add_argument('--stage',
                         choices=['prod', 'dev'],
                         required=True,
@@ -89,7 +118,7 @@ def parse_args():
                         help='Where to read the configuration file from')
 
     parser.add_argument('--target',
-                        choices=sorted([value.__name__ for value in get_concrete_subclasses(Terminator)] + ['Database']),
+                        choices=sorted(list(TERMINATORS) + ['Database']),
                         metavar='target',
                         action='append',
                         help='class to run')
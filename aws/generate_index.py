@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+"""Generate the index of terminator types, which allows plugin modules to be imported only when their types are needed."""
+
+import argparse
+import ast
+import os
+import sys
+import typing
+
+import terminator
+
+INDEX_PATH = os.path.join(os.path.dirname(terminator.__file__), '_index.py')
+
+HEADER = '''\
+# This file is generated by generate_index.py, do not edit it by hand.
+# Run "python generate_index.py" in the aws directory after adding, removing or changing terminator types.
+
+TERMINATORS = {
+'''
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate the index of terminator types.')
+
+    parser.add_argument('--check',
+                        action='store_true',
+                        help='exit with an error if the index is out of date, instead of updating it')
+
+    args = parser.parse_args()
+
+    source = generate()
+
+    with open(INDEX_PATH, encoding='utf-8') as index_fd:
+        current = index_fd.read()
+
+    if args.check:
+        if current != source:
+            sys.exit(f'{INDEX_PATH} is out of date, run generate_index.py to update it')
+
+        return
+
+    if current != source:
+        with open(INDEX_PATH, 'w', encoding='utf-8') as index_fd:
+            index_fd.write(source)
+
+
+def generate() -> str:
+    # every plugin module is imported here, without the existing index, so a stale index cannot hide new types
+    plugin_dir = os.path.dirname(INDEX_PATH)
+    module_names = sorted(os.path.splitext(name)[0] for name in os.listdir(plugin_dir) if name.endswith('.py') and not name.startswith('_'))
+
+    services: typing.Dict[str, str] = {}
+
+    for module_name in module_names:
+        __import__(f'terminator.{module_name}')
+
+        with open(os.path.join(plugin_dir, f'{module_name}.py'), encoding='utf-8') as module_fd:
+            services.update(get_services(ast.parse(module_fd.read())))
+
+    lines = [HEADER]
+
+    for terminator_type in sorted(terminator.get_concrete_subclasses(terminator.Terminator), key=lambda value: value.__name__):
+        # types which inherit create from another type use the service of that type
+        service = next((services[value.__name__] for value in terminator_type.__mro__ if value.__name__ in services), None)
+
+        dependencies = repr(tuple(terminator_type.dependencies))
+
+        if len(dependencies) > 100:
+            dependencies = '(\n' + ''.join(f'            {name!r},\n' for name in terminator_type.dependencies) + '        )'
+
+        lines.append(f'''\
+    {terminator_type.__name__!r}: {{
+        'module': {terminator_type.__module__.rsplit('.', 1)[-1]!r},
+        'service': {service!r},
+        'dependencies': {dependencies},
+        'global_resource': {terminator_type.global_resource!r},
+    }},
+''')
+
+    lines.append('}\n')
+
+    return ''.join(lines)
+
+
+def get_services(module: ast.Module) -> typing.Dict[str, str]:
+    """Return the service name passed to Terminator._create by each class in the module which calls it."""
+    services = {}
+
+    for class_node in module.body:
+        if not isinstance(class_node, ast.ClassDef):
+            continue
+
+        for node in ast.walk(class_node):
+            if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == '_create':
+                service = get_constant(node.args[2]) if len(node.args) > 2 else None
+
+                if service:
+                    services[class_node.name] = service
+                    break
+
+    return services
+
+
+def get_constant(node: ast.expr) -> typing.Optional[str]:
+    return node.value if isinstance(node, ast.Constant) and isinstance(node.value, str) else None
+
+
+if __name__ == '__main__':
+    main()
@@ -1,90 +1,463 @@
 import abc
+import concurrent.futures
+import contextlib
 import datetime
 import inspect
-import logging
-import os
+import math
 import re
+import threading
+import time
 import typing
 
+from queue import Full, Queue
+
 from boto3.dynamodb.conditions import Attr
 import boto3
 import botocore
 import botocore.client
+import botocore.config
+import botocore.credentials
 import botocore.exceptions
+import botocore.session
 import dateutil.tz
 
-logger = logging.getLogger('cleanup')
-
-AWS_REGION = 'us-east-1'
+from ._clients import ClientPool, DescribeCache, paginate
+from ._common import AWS_REGION, _current, logger
+from ._governor import RATE_LIMITS, RateGovernor
+from ._index import TERMINATORS
+from ._kvs import KVS_SCAN_SEGMENTS, KeyValueStore
+from ._metrics import METRICS_NAMESPACE, ApiMetrics
+from ._state import SweepCursor, TerminationHistory, clear_state, get_state, set_state, state
+
+# maximum number of concurrent requests against a single service endpoint when running with multiple jobs
+SERVICE_JOBS = 4
+SERVICE_JOBS_OVERRIDES = {
+    'ec2': 6,
+    'ses': 1,
+    'waf': 1,
+}
+
+# shared by every client in the pool, connections are sized to exceed the per-service request limits above
+CLIENT_CONFIG = botocore.config.Config(
+    max_pool_connections=16,
+    tcp_keepalive=True,
+    connect_timeout=10,
+    read_timeout=30,
+)
+
+# errors which indicate the cached sessions can no longer be used
+CREDENTIALS_ERROR_CODES = frozenset((
+    'ExpiredToken',
+    'ExpiredTokenException',
+    'InvalidClientTokenId',
+    'UnrecognizedClientException',
+))
+
+# buffered key/value store changes are flushed this many seconds before the deadline
+KVS_FLUSH_MARGIN = 10
+# a snapshot loaded by an earlier run in the same process, such as a warm Lambda container, is reused until it is this many seconds old
+KVS_SNAPSHOT_AGE = 15 * 60
+# maximum number of stale key/value store entries purged per run
+PURGE_BUDGET = 5000
+# no further terminator types are started once fewer than this many seconds remain before the deadline
+SWEEP_MARGIN = 30
+
+# seconds a terminated resource is skipped by later sweeps, while it is still being deleted, unless the type overrides it
+TOMBSTONE_TTL = 15 * 60
+
+# number of discovered resources buffered ahead of the ones being processed
+DISCOVERY_READ_AHEAD = 1000
+
+# properties of a terminator which are recorded when it is discovered, so its describe result does not need to be kept
+RECORD_PROPERTIES = ('id', 'name', 'created_time', 'ignore')
+
+# number of concurrent detail lookups made by a terminator type for listings which have no bulk describe call
+DESCRIBE_JOBS = 4
 
 T = typing.TypeVar('T')
 
+_END = object()
+
+_service_slots: typing.Dict[typing.Tuple[str, str], threading.BoundedSemaphore] = {}
+_service_slots_lock = threading.Lock()
+
+# sessions are kept between runs, such as invocations of a warm Lambda container, along with the pooled clients created from them
+_sessions: typing.Dict[str, boto3.Session] = {}
+_regional_sessions: typing.Dict[typing.Tuple[boto3.Session, str], boto3.Session] = {}
+_sessions_lock = threading.Lock()
+_sessions_invalid = threading.Event()
 
-def import_plugins() -> None:
-    skip_files = ('__init__.py',)
-    import_names = [os.path.splitext(name)[0] for name in os.listdir(os.path.dirname(__file__)) if name.endswith('.py') and name not in skip_files]
-    for import_name in import_names:
+
+def import_plugins(names: typing.Optional[typing.Iterable[str]] = None) -> None:
+    """Import the plugin modules defining the given terminator types, or every plugin module."""
+    import_names = {TERMINATORS[name]['module'] for name in (TERMINATORS if names is None else names)}
+    for import_name in sorted(import_names):
         __import__(f'terminator.{import_name}')
 
 
-def cleanup(stage: str, check: bool, force: bool, api_name: str, test_account_id: str, targets: typing.Optional[typing.List[str]] = None) -> None:
-    kvs.domain_name = re.sub(r'[^a-zA-Z0-9]+', '-', f'{api_name}-resources-{stage}')
-    kvs.initialize()
+def get_terminator_types(names: typing.Optional[typing.Iterable[str]] = None) -> typing.List[typing.Type['Terminator']]:
+    """Return the given terminator types, or every type, sorted by name. Only the plugin modules defining them are imported."""
+    names = sorted(TERMINATORS if names is None else names)
+    import_plugins(names)
+
+    terminator_types = {terminator_type.__name__: terminator_type for terminator_type in get_concrete_subclasses(Terminator)}
+    missing = [name for name in names if name not in terminator_types]
+
+    if missing:
+        raise Exception(f'indexed terminator types not found, run generate_index.py to update the index: {", ".join(missing)}')
+
+    return [terminator_types[name] for name in names]
 
-    cleanup_test_account(stage, check, force, api_name, test_account_id, targets)
 
-    if not targets or 'Database' in targets:
-        cleanup_database(check, force)
+def cleanup(stage: str, check: bool, force: bool, api_name: str, test_account_id: str, targets: typing.Optional[typing.List[str]] = None,
+            jobs: int = 1, deadline: typing.Optional[float] = None, purge_budget: int = PURGE_BUDGET,
+            regions: typing.Optional[typing.List[str]] = None) -> None:
+    """Run a sweep, with an optional deadline given as a time.monotonic() value."""
+    metrics.reset()
+    clock.reset(deadline)
+    describe_cache.reset()
+
+    for store, domain_name in ((kvs, f'{api_name}-resources-{stage}'), (state, f'{api_name}-state-{stage}')):
+        domain_name = re.sub(r'[^a-zA-Z0-9]+', '-', domain_name)
+
+        if store.domain_name != domain_name:
+            store.reset(domain_name)
+
+        store.initialize()
+
+        if store.snapshot is not None and time.monotonic() - store.loaded < KVS_SNAPSHOT_AGE:
+            continue
+
+        # noinspection PyBroadException
+        try:
+            store.load()
+        except Exception:  # pylint: disable=broad-except
+            logger.exception('exception loading key/value store %s, falling back to individual requests', store.domain_name)
+            store.reset()
+
+    flush_timer = None
+
+    if deadline is not None:
+        flush_timer = threading.Timer(max(0.0, deadline - time.monotonic() - KVS_FLUSH_MARGIN), flush_kvs)
+        flush_timer.daemon = True
+        flush_timer.start()
+
+    try:
+        cleanup_test_account(stage, check, force, api_name, test_account_id, targets, jobs, regions, deadline)
+
+        if not targets or 'Database' in targets:
+            if deadline is not None and deadline - time.monotonic() < SWEEP_MARGIN:
+                logger.warning('skipped database purge due to the deadline')
+            else:
+                cleanup_database(check, force, purge_budget)
+    finally:
+        if flush_timer:
+            flush_timer.cancel()
+
+        flush_kvs()
+        describe_cache.reset()
+
+
+def flush_kvs() -> None:
+    for store in (kvs, state):
+        # noinspection PyBroadException
+        try:
+            store.flush()
+        except Exception:  # pylint: disable=broad-except
+            logger.exception('exception flushing key/value store %s', store.domain_name)
+            store.reset()
 
 
 def assume_session(role: str, session_name: str) -> boto3.Session:
-    sts = boto3.client('sts')
-    credentials = sts.assume_role(
-        RoleArn=role, RoleSessionName=session_name).get('Credentials')
-    return boto3.Session(
-        aws_access_key_id=credentials['AccessKeyId'],
-        aws_secret_access_key=credentials['SecretAccessKey'],
-        aws_session_token=credentials['SessionToken'])
+    """Return a session for the given role, which is kept for later runs. The role is assumed again shortly before the credentials expire."""
+    with _sessions_lock:
+        session = _sessions.get(role)
 
+        if session is None:
+            sts = boto3.client('sts')
+
+            def refresh() -> typing.Dict[str, str]:
+                credentials = sts.assume_role(
+                    RoleArn=role, RoleSessionName=session_name).get('Credentials')
+                return {
+                    'access_key': credentials['AccessKeyId'],
+                    'secret_key': credentials['SecretAccessKey'],
+                    'token': credentials['SessionToken'],
+                    'expiry_time': credentials['Expiration'].isoformat(),
+                }
+
+            session = _sessions[role] = create_session(
+                botocore.credentials.RefreshableCredentials.create_from_metadata(refresh(), refresh, 'assume-role'))
+
+    return session
+
+
+def get_regional_session(session: boto3.Session, region: str) -> boto3.Session:
+    """Return a session for the given region which shares the credentials of the given session, and is kept for later runs."""
+    with _sessions_lock:
+        regional_session = _regional_sessions.get((session, region))
+
+        if regional_session is None:
+            regional_session = _regional_sessions[(session, region)] = create_session(session.get_credentials(), region)
+
+    return regional_session
+
+
+def create_session(credentials: botocore.credentials.Credentials, region: typing.Optional[str] = None) -> boto3.Session:
+    botocore_session = botocore.session.Session()
+    botocore_session._credentials = credentials
+
+    if region:
+        botocore_session.set_config_variable('region', region)
+
+    return boto3.Session(botocore_session=botocore_session)
+
+
+def invalidate_sessions() -> None:
+    """Discard the sessions and clients kept between runs, so the next run assumes the role and creates its clients again."""
+    with _sessions_lock:
+        _sessions.clear()
+        _regional_sessions.clear()
+
+    clients.clear()
+    _sessions_invalid.clear()
+
+
+def check_credentials_error(ex: Exception) -> None:
+    if isinstance(ex, botocore.exceptions.ClientError) and ex.response['Error']['Code'] in CREDENTIALS_ERROR_CODES:
+        _sessions_invalid.set()
+
+
+def process_instance(instance: 'Terminator', check: bool, force: bool = False, history: typing.Optional['TerminationHistory'] = None) -> str:
+    # earlier terminations only matter when the instance would be terminated by this run
+    pending = history.get_status(instance, force) if history and not check and is_terminable(instance, force) else None
 
-def process_instance(instance: 'Terminator', check: bool, force: bool = False) -> str:
     if instance.ignore:
         status = 'ignored'
+    elif pending:
+        status = pending
     elif force:
-        status = terminate(instance, check)
+        status = terminate(instance, check, history)
     elif instance.age is None:
         status = 'unsupported'
     elif instance.stale:
-        status = terminate(instance, check)
+        status = terminate(instance, check, history)
     else:
         status = 'skipped'
     return status
 
 
-def cleanup_test_account(stage: str, check: bool, force: bool, api_name: str, test_account_id: str, targets: typing.Optional[typing.List[str]] = None) -> None:
+def is_terminable(instance: 'Terminator', force: bool) -> bool:
+    """Return True if process_instance would terminate the given instance."""
+    if instance.ignore:
+        return False
+
+    return force or (instance.age is not None and instance.stale)
+
+
+def log_statuses(instances: typing.List['Terminator'], statuses: typing.List[str]) -> None:
+    for instance, status in zip(instances, statuses):
+        if instance.ignore:
+            logger.debug('%s %s', status, instance)
+        else:
+            logger.info('%s %s', status, instance)
+
+
+def cleanup_test_account(stage: str, check: bool, force: bool, api_name: str, test_account_id: str, targets: typing.Optional[typing.List[str]] = None,
+                         jobs: int = 1, regions: typing.Optional[typing.List[str]] = None, deadline: typing.Optional[float] = None) -> None:
     role = f'arn:aws:iam::{test_account_id}:role/{api_name}-test-{stage}'
     credentials = assume_session(role, 'cleanup')
+    regions = regions or [AWS_REGION]
 
-    for terminator_type in sorted(get_concrete_subclasses(Terminator), key=lambda value: value.__name__):
-        if targets and terminator_type.__name__ not in targets:
-            continue
+    account.resolve(credentials, regions)
 
-        # noinspection PyBroadException
-        try:
-            # noinspection PyUnresolvedReferences
-            instances = terminator_type.create(credentials)
-
-            for instance in instances:
-                status = process_instance(instance, check, force)
-                if instance.ignore:
-                    logger.debug('%s %s', status, instance)
-                else:
-                    logger.info('%s %s', status, instance)
-        except Exception:  # pylint: disable=broad-except
-            logger.exception('exception processing resource type: %s', terminator_type)
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(regions), thread_name_prefix='region') as executor:
+            # resources of global services are only processed with the first region
+            for index, region in enumerate(regions):
+                executor.submit(cleanup_region, get_regional_session(credentials, region), check, force, targets, jobs, index == 0, deadline)
+    except Exception:
+        invalidate_sessions()
+        raise
+
+    if _sessions_invalid.is_set():
+        logger.warning('discarding cached sessions and clients after credentials errors')
+        invalidate_sessions()
+
+
+def cleanup_region(credentials: boto3.Session, check: bool, force: bool, targets: typing.Optional[typing.List[str]], jobs: int, global_resources: bool,
+                   deadline: typing.Optional[float] = None) -> None:
+    region = credentials.region_name
+    names = [name for name, entry in sorted(TERMINATORS.items()) if (not targets or name in targets) and (global_resources or not entry['global_resource'])]
+    skipped: typing.List[str] = []
+    failed: typing.List[str] = []
+
+    # only complete sweeps are resumed, since a sweep of selected types is not expected to run out of time
+    cursor = SweepCursor(region, names) if not targets and not check else None
+
+    if cursor:
+        names = [name for name in names if name not in cursor.completed]
+
+    # noinspection PyBroadException
+    try:
+        # selecting types by name first means only the plugin modules of the remaining types are imported
+        terminator_types = get_terminator_types(names)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, jobs), thread_name_prefix=f'terminator-{region}') as executor:
+            for index, wave in enumerate(get_waves(terminator_types)):
+                # types are started in priority order, so those left over when the deadline is reached are the least overdue
+                wave = sorted(wave, key=lambda value: get_priority(value, region), reverse=True)
+
+                logger.debug('processing wave %d in %s: %s', index, region, ', '.join(terminator_type.__name__ for terminator_type in wave))
+
+                # every type in a wave must finish before the types they depend on are processed
+                futures = {executor.submit(cleanup_terminator_type, terminator_type, credentials, check, force, deadline): terminator_type
+                           for terminator_type in wave}
+                concurrent.futures.wait(futures)
+                completed = []
+
+                # each type is checked on its own, so an error escaping one type does not stop the remaining waves
+                for future, terminator_type in futures.items():
+                    # noinspection PyBroadException
+                    try:
+                        started = future.result()
+                    except Exception:  # pylint: disable=broad-except
+                        logger.exception('exception processing resource type: %s', terminator_type)
+                        failed.append(terminator_type.__name__)
+                        continue
+
+                    (completed if started else skipped).append(terminator_type.__name__)
+
+                if cursor:
+                    cursor.update(completed)
+    except Exception:  # pylint: disable=broad-except
+        logger.exception('exception processing region: %s', region)
+
+    if failed:
+        logger.warning('failed %d resource types in %s: %s', len(failed), region, ', '.join(sorted(failed)))
+
+    if skipped:
+        logger.warning('skipped %d resource types in %s due to the deadline: %s', len(skipped), region, ', '.join(sorted(skipped)))
+
+
+def get_waves(terminator_types: typing.List[typing.Type['Terminator']]) -> typing.List[typing.List[typing.Type['Terminator']]]:
+    """Group terminator types into waves, so each type is processed only after every type which depends on it."""
+    known_names = set(TERMINATORS)
+    remaining = {terminator_type.__name__: terminator_type for terminator_type in terminator_types}
+    waves = []
+
+    for terminator_type in terminator_types:
+        for dependency in set(terminator_type.dependencies) - known_names:
+            logger.error('unknown dependency %s declared by %s', dependency, terminator_type.__name__)
+
+    while remaining:
+        blocked = {dependency for terminator_type in remaining.values() for dependency in terminator_type.dependencies}
+        wave = [terminator_type for name, terminator_type in remaining.items() if name not in blocked]
+
+        if not wave:
+            raise Exception(f'dependency cycle between terminator types: {", ".join(sorted(remaining))}')
+
+        waves.append(sorted(wave, key=lambda value: value.__name__))
+
+        for terminator_type in wave:
+            del remaining[terminator_type.__name__]
+
+    return waves
+
+
+def get_type_region(terminator_type: typing.Type['Terminator'], region: str) -> str:
+    """Return the region under which the state of the given type is kept, which is the same for every region if the type is global."""
+    return AWS_REGION if terminator_type.global_resource else region
+
+
+def get_type_key(terminator_type: typing.Type['Terminator'], region: str) -> str:
+    return f'type:{get_type_region(terminator_type, region)}:{terminator_type.__name__}'
+
+
+def get_priority(terminator_type: typing.Type['Terminator'], region: str) -> float:
+    """Favor types with failed terminations due to be retried, then types which have gone the longest without being completed relative to their duration."""
+    stats = get_state(get_type_key(terminator_type, region))
+
+    if not stats or TerminationHistory.has_due_retries(stats):
+        return math.inf
+
+    # the extra second keeps types which finish almost instantly from always coming first
+    return (time.time() - stats['completed']) / (stats['duration'] + 1)
 
 
-def cleanup_database(check: bool, force: bool) -> None:
+def cleanup_terminator_type(terminator_type: typing.Type['Terminator'], credentials: boto3.Session, check: bool, force: bool,
+                            deadline: typing.Optional[float] = None) -> bool:
+    """Process every instance of the given type, returning False if the type was not started due to the deadline."""
+    if deadline is not None and deadline - time.monotonic() < SWEEP_MARGIN:
+        return False
+
+    start = time.monotonic()
+    _current.terminator_type = terminator_type.__name__
+    _current.force = force
+
+    type_key = get_type_key(terminator_type, credentials.region_name)
+    history = TerminationHistory(terminator_type.__name__, get_type_region(terminator_type, credentials.region_name), terminator_type.tombstone_ttl)
+    listed = False
+    count = 0
+    last = None
+
+    # noinspection PyBroadException
+    try:
+        batch: typing.List['Terminator'] = []
+        batch_size = 0 if check else terminator_type.batch_size
+
+        # noinspection PyUnresolvedReferences
+        for instance in terminator_type.create(credentials):
+            count += 1
+            last = instance
+            history.listed(instance)
+
+            if batch_size and is_terminable(instance, force) and not history.get_status(instance, force):
+                batch.append(instance)
+
+                if len(batch) >= batch_size:
+                    log_statuses(batch, terminate_batch(batch, history))
+                    batch = []
+
+                continue
+
+            log_statuses([instance], [process_instance(instance, check, force, history)])
+
+        if batch:
+            log_statuses(batch, terminate_batch(batch, history))
+
+        listed = True
+    except Exception as ex:  # pylint: disable=broad-except
+        check_credentials_error(ex)
+        logger.exception('exception processing resource type: %s', terminator_type)
+    finally:
+        _current.terminator_type = None
+        _current.force = False
+
+    if not check:
+        if listed:
+            terminator_type.save_progress(count, last)
+
+        set_state(type_key, dict(history.save(listed), completed=time.time(), duration=round(time.monotonic() - start, 1)))
+
+    return True
+
+
+@contextlib.contextmanager
+def service_slot(service_name: str, region: str) -> typing.Iterator[None]:
+    """Limit the number of concurrent requests made to a single service endpoint across all jobs."""
+    with _service_slots_lock:
+        slot = _service_slots.get((service_name, region))
+
+        if slot is None:
+            slot = _service_slots[(service_name, region)] = threading.BoundedSemaphore(SERVICE_JOBS_OVERRIDES.get(service_name, SERVICE_JOBS))
+
+    with slot:
+        yield
+
+
+def cleanup_database(check: bool, force: bool, budget: int = PURGE_BUDGET) -> None:
+    start = time.monotonic()
     scan_options = {}
 
     if not force:
@@ -92,53 +465,136 @@ def cleanup_database(check: bool, force: bool) -> None:
         scan_options['FilterExpression'] = Attr('created_time').lt(now.isoformat())
 
     scan_options['ProjectionExpression'] = kvs.primary_key
-    scan_options['Limit'] = 25
     scan_options['ConsistentRead'] = False
 
-    result = kvs.table.scan(
-        **scan_options
-    )
-
-    if 'Items' not in result:
-        return
-
-    items = result['Items']
-
-    if items and not check:
-        with kvs.table.batch_writer():
-            for item in items:
-                kvs.table.delete_item(Key=item)
-
     if check:
         status = 'checked'
     else:
         status = 'purged'
 
-    for item in items:
-        logger.info('%s database item: %s', status, item['id'])
+    count = purge_items(kvs, scan_options, check, status, budget)
+
+    # sweep state which was not written again before it expired, such as that of removed types or regions, or of buckets deleted elsewhere
+    if count < budget:
+        count += purge_items(state, {'FilterExpression': Attr(state.expiry_key).lt(int(time.time())), 'ProjectionExpression': state.primary_key},
+                             check, status, budget - count)
+
+    logger.info('%s database items: count=%d, elapsed=%.1fs', status, count, time.monotonic() - start)
 
 
-def terminate(instance: 'Terminator', check: bool) -> str:
+def purge_items(store: KeyValueStore, scan_options: typing.Dict[str, typing.Any], check: bool, status: str, budget: int) -> int:
+    """Delete the items found by scanning the given store, up to the budget, returning how many were found."""
+    count = 0
+
+    with contextlib.closing(store.scan(KVS_SCAN_SEGMENTS, **scan_options)) as pages:
+        for page in pages:
+            for item in page[:budget - count]:
+                if not check:
+                    store.delete(item[store.primary_key])
+
+                logger.info('%s database item: %s', status, item[store.primary_key])
+
+            count += min(len(page), budget - count)
+
+            if count >= budget:
+                logger.info('reached database purge budget: count=%d', budget)
+                break
+
+    return count
+
+
+def terminate(instance: 'Terminator', check: bool, history: typing.Optional['TerminationHistory'] = None) -> str:
     if check:
         return 'checked'
 
     # noinspection PyBroadException
     try:
-        instance.terminate()
-        instance.cleanup()
+        with service_slot(instance.client.meta.service_model.service_name, instance.client.meta.region_name):
+            try:
+                instance.terminate()
+            finally:
+                describe_cache.invalidate(instance.client)
     except botocore.exceptions.ClientError as ex:
         error_code = ex.response['Error']['Code']
+        check_credentials_error(ex)
 
         if error_code == 'TooManyRequestsException':
             logger.warning('error "%s" terminating %s', error_code, instance, exc_info=True)
         else:
             logger.exception('error "%s" terminating %s', error_code, instance)
-    except Exception:  # pylint: disable=broad-except
+
+        if history:
+            history.failed(instance, error_code)
+
+        return 'failed'
+    except TerminationIncomplete as ex:
+        # neither a tombstone nor a retry is recorded, so the next run continues where this one stopped
+        logger.warning('incomplete %s: %s', instance, ex)
+        return 'incomplete'
+    except Exception as ex:  # pylint: disable=broad-except
         logger.exception('exception terminating %s', instance)
 
+        if history:
+            history.failed(instance, type(ex).__name__)
+
+        return 'failed'
+
+    if history:
+        history.terminated(instance)
+
+    # noinspection PyBroadException
+    try:
+        instance.cleanup()
+    except Exception:  # pylint: disable=broad-except
+        logger.exception('exception cleaning up %s', instance)
+
     return 'terminated'
 
 
+def terminate_batch(instances: typing.List['Terminator'], history: typing.Optional['TerminationHistory'] = None) -> typing.List[str]:
+    """Terminate instances of a single type with as few requests as its API allows, returning the status of each instance."""
+    terminator_type = type(instances[0])
+    client = instances[0].client
+
+    # noinspection PyBroadException
+    try:
+        with service_slot(client.meta.service_model.service_name, client.meta.region_name):
+            try:
+                failures = terminator_type.terminate_batch(instances)
+            finally:
+                describe_cache.invalidate(client)
+    except Exception as ex:  # pylint: disable=broad-except
+        check_credentials_error(ex)
+        # a single resource can fail the whole request, such as an EC2 instance with termination protection, so each one is retried on its own
+        logger.warning('exception terminating %d %s resources, terminating them individually', len(instances), terminator_type.__name__, exc_info=True)
+        return [terminate(instance, False, history) for instance in instances]
+
+    statuses = []
+
+    for instance in instances:
+        if instance in failures:
+            logger.error('error "%s" terminating %s', failures[instance], instance)
+
+            if history:
+                history.failed(instance, failures[instance])
+
+            statuses.append('failed')
+            continue
+
+        if history:
+            history.terminated(instance)
+
+        # noinspection PyBroadException
+        try:
+            instance.cleanup()
+        except Exception:  # pylint: disable=broad-except
+            logger.exception('exception cleaning up %s', instance)
+
+        statuses.append('terminated')
+
+    return statuses
+
+
 def get_concrete_subclasses(class_type: typing.Type[T]) -> typing.Set[typing.Type[T]]:
     subclasses: typing.Set[typing.Type[T]] = set()
     queue: typing.List[typing.Type[T]] = [class_type]
@@ -156,7 +612,19 @@ def get_concrete_subclasses(class_type: typing.Type[T]) -> typing.Set[typing.Typ
 
 
 def get_account_id(session: boto3.Session) -> str:
-    return session.client('sts').get_caller_identity().get('Account')
+    return account.get_account_id(session)
+
+
+def describe_concurrently(function: typing.Callable[[T], typing.Any], items: typing.Iterable[T]) -> typing.Iterator[typing.Any]:
+    """Yield the result of calling the function with each item, in order, making up to DESCRIBE_JOBS calls at once."""
+    terminator_type = getattr(_current, 'terminator_type', None)
+
+    def call(item: T) -> typing.Any:
+        _current.terminator_type = terminator_type
+        return function(item)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=DESCRIBE_JOBS, thread_name_prefix='describe') as executor:
+        yield from executor.map(call, items)
 
 
 def get_tag_dict_from_tag_list(tag_list: typing.Optional[typing.List[typing.Dict[str, str]]]) -> typing.Dict[str, str]:
@@ -166,18 +634,145 @@ def get_tag_dict_from_tag_list(tag_list: typing.Optional[typing.List[typing.Dict
     return dict((tag['Key'], tag['Value']) for tag in tag_list)
 
 
-class Terminator(abc.ABC):
+class AccountContext:
+    """Details of the test account needed by many terminator types, resolved once per sweep instead of by each type or instance."""
+    def __init__(self):
+        self.account_id: typing.Optional[str] = None
+        self._default_vpcs: typing.Dict[str, typing.Dict[str, typing.Any]] = {}
+        self._lock = threading.Lock()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.account_id = None
+            self._default_vpcs.clear()
+
+    def resolve(self, session: boto3.Session, regions: typing.List[str]) -> None:
+        """Resolve the account id and the default VPC of each region concurrently, at the start of a sweep."""
+        self.reset()
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(regions) + 1, thread_name_prefix='account') as executor:
+            futures = [executor.submit(self.get_account_id, session)]
+            futures.extend(executor.submit(self.get_default_vpc, clients.get(get_regional_session(session, region), 'ec2')) for region in regions)
+
+        for future in futures:
+            # noinspection PyBroadException
+            try:
+                future.result()
+            except Exception as ex:  # pylint: disable=broad-except
+                # anything which could not be resolved now is requested again when first needed
+                check_credentials_error(ex)
+                logger.exception('exception resolving account details')
+
+    def get_account_id(self, session: boto3.Session) -> str:
+        if self.account_id is None:
+            self.account_id = clients.get(session, 'sts').get_caller_identity().get('Account')
+
+        return self.account_id
+
+    def get_default_vpc(self, client: botocore.client.BaseClient) -> typing.Dict[str, typing.Any]:
+        """Return the default VPC of the region of the given EC2 client, or an empty dict if the region has none."""
+        region = client.meta.region_name
+
+        with self._lock:
+            default_vpc = self._default_vpcs.get(region)
+
+        if default_vpc is None:
+            vpcs = client.describe_vpcs(Filters=[{'Name': 'isDefault', 'Values': ['true']}])['Vpcs']
+            default_vpc = vpcs[0] if vpcs else {}
+
+            with self._lock:
+                self._default_vpcs[region] = default_vpc
+
+        return default_vpc
+
+
+class SweepClock:
+    """The time and deadline of the current sweep, shared by every terminator instance instead of each one taking its own."""
+    def __init__(self):
+        self.now = datetime.datetime.utcnow().replace(tzinfo=dateutil.tz.tzutc(), microsecond=0)
+        self.deadline: typing.Optional[float] = None
+
+    def reset(self, deadline: typing.Optional[float] = None) -> None:
+        self.now = datetime.datetime.utcnow().replace(tzinfo=dateutil.tz.tzutc(), microsecond=0)
+        self.deadline = deadline
+
+    def remaining(self) -> float:
+        """Return the seconds left before the deadline of the sweep, which are unlimited if it has no deadline."""
+        return math.inf if self.deadline is None else self.deadline - time.monotonic()
+
+
+class TerminationIncomplete(Exception):
+    """Raised by a terminator which stopped before the deadline of the sweep, leaving the rest of the termination to the next run."""
+
+
+class TerminatorMeta(abc.ABCMeta):
+    """Give terminator classes empty __slots__ unless they declare their own, so instances are compact records without a __dict__.
+
+    The record properties of each class return the values recorded when the terminator was discovered, once it has been compacted.
+    """
+    def __new__(mcs, name, bases, namespace, **kwargs):
+        namespace.setdefault('__slots__', ())
+
+        for index, property_name in enumerate(RECORD_PROPERTIES):
+            value = namespace.get(property_name)
+
+            if isinstance(value, property) and not getattr(value, '__isabstractmethod__', False):
+                namespace[property_name] = mcs._recorded(value, index)
+
+        return super().__new__(mcs, name, bases, namespace, **kwargs)
+
+    @staticmethod
+    def _recorded(value: property, index: int) -> property:
+        def fget(self: 'Terminator') -> typing.Any:
+            record = self._record  # pylint: disable=protected-access
+            return value.fget(self) if record is None else record[index]
+
+        return property(fget, doc=value.__doc__)
+
+
+class Terminator(abc.ABC, metaclass=TerminatorMeta):
     """Base class for classes which find and terminate AWS resources."""
-    _default_vpc = None  # safe as long as executing only within a single region
+    # Classes which store additional state on their instances must declare it in __slots__.
+    __slots__ = ('client', 'instance', '_record')
+
+    # Names of the terminator types this type depends on, for example a subnet depends on its VPC.
+    # Those types are processed in a later wave, so resources which depend on them are removed first.
+    dependencies: typing.Tuple[str, ...] = ()
+
+    # Resources of global services, such as IAM or CloudFront, are processed once instead of once per region.
+    global_resource = False
+
+    # Keyword arguments passed to the describe function of the type, so the service leaves out resources which would be ignored.
+    # The ignore property is still checked, since a filter may be applied loosely, such as a case-insensitive name prefix.
+    describe_filter: typing.Dict[str, typing.Any] = {}
+
+    # Terminated resources are skipped by later sweeps for this long, or until they are no longer listed,
+    # since many deletions complete in the background and repeating them only wastes requests.
+    tombstone_ttl = datetime.timedelta(seconds=TOMBSTONE_TTL)
+
+    # Types whose API can delete many resources in one request set this to the largest number it accepts and implement terminate_batch.
+    batch_size = 0
+
+    # Fields of the describe result used to terminate a resource, other than those of the record properties, which are kept once it is discovered.
+    record_fields: typing.Tuple[str, ...] = ()
 
     def __init__(self, client: botocore.client.BaseClient, instance: typing.Dict[str, typing.Any]):
         self.client = client
         self.instance = instance
-        self.now = datetime.datetime.utcnow().replace(tzinfo=dateutil.tz.tzutc(), microsecond=0)
+        self._record: typing.Optional[typing.Tuple[typing.Any, ...]] = None
+
+    @property
+    def now(self) -> datetime.datetime:
+        return clock.now
+
+    @property
+    def deadline_reached(self) -> bool:
+        """Return True if the sweep is close enough to its deadline that a long running termination should stop, so the sweep can finish in time."""
+        return clock.remaining() < SWEEP_MARGIN
 
     @staticmethod
     @abc.abstractmethod
-    def create(credentials: boto3.Session) -> typing.List['Terminator']:
+    def create(credentials: boto3.Session) -> typing.Iterable['Terminator']:
         pass
 
     @property
@@ -209,6 +804,26 @@ class Terminator(abc.ABC):
     def cleanup(self) -> None:
         """Cleanup to perform after termination."""
 
+    @classmethod
+    def save_progress(cls, count: int, last: typing.Optional['Terminator']) -> None:
+        """Record where the next run continues, for types which list part of their resources per run. Check runs do not call this."""
+
+    @staticmethod
+    def terminate_batch(instances: typing.List['Terminator']) -> typing.Dict['Terminator', str]:
+        """Terminate or delete the given AWS resources of this type, returning the error code of each one which was not deleted."""
+        for instance in instances:
+            instance.terminate()
+
+        return {}
+
+    def compact(self, force: bool = False) -> None:
+        """Record the properties of the resource and drop its describe result, keeping the record fields only if it may be terminated."""
+        ignore = self.ignore
+        # the age of an ignored resource is not needed, and may not be available
+        self._record = (self.id, self.name, None if ignore else self.created_time, ignore)
+        terminable = not ignore and (force or self.stale)
+        self.instance = {key: self.instance[key] for key in self.record_fields if key in self.instance} if terminable else {}
+
     @property
     def age(self) -> typing.Optional[datetime.timedelta]:
         return self.now - self.created_time if self.created_time else None
@@ -225,6 +840,9 @@ class Terminator(abc.ABC):
             else:
                 extra = ''
 
+            if self.client.meta.region_name != AWS_REGION and not self.global_resource:
+                extra += f'region={self.client.meta.region_name} '
+
             return f'{type(self).__name__}: name={self.name}, {extra}age={self.age}, stale={self.stale}'
         except Exception:  # pylint: disable=broad-except
             logger.exception('exception converting %s to string', type(self).__name__)
@@ -232,25 +850,72 @@ class Terminator(abc.ABC):
 
     @staticmethod
     def _create(session: boto3.Session, instance_type: typing.Type['Terminator'], client_name: str,
-                describe_lambda: typing.Callable[[botocore.client.BaseClient], typing.List[typing.Dict[str, typing.Any]]]) -> typing.List['Terminator']:
-        client = session.client(client_name, region_name=AWS_REGION)
-        instances = describe_lambda(client)
-        terminators = [instance_type(client, instance) for instance in instances]
-        logger.debug('located %s: count=%d', instance_type.__name__, len(terminators))
+                describe_lambda: typing.Callable[..., typing.Iterable[typing.Any]]) -> typing.Iterator['Terminator']:
+        """Yield a terminator for each resource as it is discovered, while a background thread reads ahead of the ones being processed."""
+        # global resources always use the default region, which CloudFront scoped WAF resources require
+        client = clients.get(session, client_name, AWS_REGION if instance_type.global_resource else None)
+        region = client.meta.region_name
+        found: Queue = Queue(DISCOVERY_READ_AHEAD)
+        stop = threading.Event()
+        terminator_type = getattr(_current, 'terminator_type', None)
+
+        def put(item: typing.Any) -> bool:
+            # the consumer may stop before the listing is done, so the producer must not block on a full queue forever
+            while not stop.is_set():
+                try:
+                    found.put(item, timeout=1)
+                    return True
+                except Full:
+                    pass
+
+            return False
+
+        def produce() -> None:
+            _current.terminator_type = terminator_type
+            count = 0
+
+            # noinspection PyBroadException
+            try:
+                with service_slot(client_name, region):
+                    items = iter(describe_lambda(client, **instance_type.describe_filter))
+
+                while True:
+                    # the slot is only held while fetching, so terminations of the same service are not blocked by a full queue
+                    with service_slot(client_name, region):
+                        item = next(items, _END)
+
+                    if item is _END or not put(item):
+                        break
+
+                    count += 1
+            except Exception as ex:  # pylint: disable=broad-except
+                put(ex)
+            finally:
+                logger.debug('located %s: count=%d', instance_type.__name__, count)
+                put(_END)
+
+        threading.Thread(target=produce, name=f'discover-{instance_type.__name__}', daemon=True).start()
 
-        return terminators
+        try:
+            while True:
+                item = found.get()
 
-    @property
-    def default_vpc(self) -> typing.Dict[str, str]:
-        if self._default_vpc is None:
-            vpcs = self.client.describe_vpcs(Filters=[{'Name': 'isDefault', 'Values': ['true']}])['Vpcs']
+                if item is _END:
+                    return
 
-            if vpcs:
-                self._default_vpc = vpcs[0]  # found default VPC
-            else:
-                self._default_vpc = {}  # no default VPC
+                if isinstance(item, Exception):
+                    raise item
 
-        return self._default_vpc
+                terminator = instance_type(client, item)
+                terminator.compact(getattr(_current, 'force', False))
+
+                yield terminator
+        finally:
+            stop.set()
+
+    @property
+    def default_vpc(self) -> typing.Dict[str, str]:
+        return account.get_default_vpc(self.client)
 
     def is_vpc_default(self, vpc_id: str) -> bool:
         return self.default_vpc.get('VpcId') == vpc_id
@@ -258,6 +923,8 @@ class Terminator(abc.ABC):
 
 class DbTerminator(Terminator):
     """Base class for classes which find and terminate AWS resources with age tracked via DynamoDB."""
+    __slots__ = ('_kvs_key', '_kvs_value', '_created_time')
+
     def __init__(self, client: botocore.client.BaseClient, instance: typing.Dict[str, typing.Any]):
         super().__init__(client, instance)
 
@@ -270,7 +937,10 @@ class DbTerminator(Terminator):
 
         # noinspection PyBroadException
         try:
-            self._kvs_key = f'{type(self).__name__}:{self.id or self.name}'
+            if self.client.meta.region_name == AWS_REGION or self.global_resource:
+                self._kvs_key = f'{type(self).__name__}:{self.id or self.name}'
+            else:
+                self._kvs_key = f'{type(self).__name__}:{self.client.meta.region_name}:{self.id or self.name}'
             self._kvs_value = kvs.get(self._kvs_key)
 
             if not self._kvs_value:
@@ -303,87 +973,10 @@ class DbTerminator(Terminator):
         kvs.delete(self._kvs_key)
 
 
-class KeyValueStore:
-    """ DynamoDB data store for the AWS terminator """
-    def __init__(self, domain_name: typing.Optional[str] = None):
-        self.ddb = None
-        self.domain_name = domain_name
-        self.table = None
-        self.primary_key = 'id'
-        self.initialized = False
-
-    def initialize(self) -> None:
-        """Deferred initialization of the DynamoDB database."""
-        if self.initialized:
-            return
-
-        self.ddb = boto3.resource('dynamodb', region_name=AWS_REGION)
-
-        try:
-            self.table = self.ddb.Table(self.domain_name)
-            if self.table.table_status == 'DELETING':
-                self.table.wait_until_not_exists()
-                self.create_table()
-        except botocore.exceptions.ClientError as ex:
-            if ex.response['Error']['Code'] == 'ResourceNotFoundException':
-                self.create_table()
-            else:
-                raise ex
-
-        self.initialized = True
-
-    def get(self, key: str) -> str:
-        self.initialize()
-
-        item = self.table.get_item(
-            Key={self.primary_key: key},
-            ProjectionExpression='created_time',
-        ).get('Item', {})
-
-        return item.get('created_time')
-
-    def set(self, key: str, value: str) -> None:
-        self.initialize()
-
-        # Don't replace an existing entry
-        expression = Attr(self.primary_key).ne(key)
-
-        attributes = {
-            self.primary_key: key,
-            'created_time': value,
-        }
-
-        self.table.put_item(
-            Item=attributes,
-            ConditionExpression=expression,
-        )
-
-    def create_table(self) -> None:
-        """Creates a new DynamoDB database."""
-        self.table = self.ddb.create_table(
-            TableName=self.domain_name,
-            AttributeDefinitions=[{
-                'AttributeName': self.primary_key,
-                'AttributeType': 'S'
-            }],
-            KeySchema=[{
-                'AttributeName': self.primary_key,
-                'KeyType': 'HASH'
-            }],
-            BillingMode='PAY_PER_REQUEST',
-        )
-        self.table.wait_until_exists()
-
-    def delete(self, key: str) -> None:
-        self.initialize()
-
-        self.table.delete_item(
-            Key={
-                self.primary_key: key
-            },
-        )
-
-
-import_plugins()
-
+governor = RateGovernor(RATE_LIMITS)
+clock = SweepClock()
+account = AccountContext()
+metrics = ApiMetrics(METRICS_NAMESPACE)
+clients = ClientPool(CLIENT_CONFIG, [governor.register, metrics.register])
+describe_cache = DescribeCache()
 kvs = KeyValueStore()
@@ -0,0 +1,98 @@
+"""Boto3 clients and listing results shared by the terminator types of a sweep."""
+
+import json
+import threading
+import typing
+
+import boto3
+import botocore.client
+import botocore.config
+
+from ._common import AWS_REGION
+
+T = typing.TypeVar('T')
+
+
+def paginate(client: botocore.client.BaseClient, operation_name: str, result_key: str, **kwargs) -> typing.Iterator[typing.Any]:
+    """Yield the items of a paginated listing one page at a time, instead of building the full result first."""
+    for page in client.get_paginator(operation_name).paginate(**kwargs):
+        yield from page.get(result_key, [])
+
+
+class ClientPool:
+    """Boto3 clients shared by all terminator types for the duration of a sweep."""
+    def __init__(self, config: botocore.config.Config, hooks: typing.Optional[typing.List[typing.Callable[[botocore.client.BaseClient], None]]] = None):
+        self.config = config
+        self.hooks = hooks or []
+        self._clients: typing.Dict[typing.Tuple[boto3.Session, str, str], botocore.client.BaseClient] = {}
+        self._lock = threading.Lock()
+
+    def get(self, session: boto3.Session, service_name: str, region_name: typing.Optional[str] = None) -> botocore.client.BaseClient:
+        region_name = region_name or session.region_name or AWS_REGION
+        key = (session, service_name, region_name)
+
+        # boto3 sessions are not thread safe, so clients are also created while holding the lock
+        with self._lock:
+            client = self._clients.get(key)
+
+            if client is None:
+                client = self._clients[key] = session.client(service_name, region_name=region_name, config=self.config)
+
+                for hook in self.hooks:
+                    hook(client)
+
+        return client
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clients.clear()
+
+
+class DescribeCache:
+    """Results of listing calls made during a sweep, so terminator types which make the same call share a single request."""
+    def __init__(self):
+        self._results: typing.Dict[typing.Tuple[str, str, str], typing.Any] = {}
+        self._locks: typing.Dict[typing.Tuple[str, str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._results.clear()
+            self._locks.clear()
+
+    def call(self, client: botocore.client.BaseClient, operation_name: str, **kwargs) -> typing.Dict[str, typing.Any]:
+        """Return the response of the given operation, which is only requested once per sweep unless invalidated."""
+        return self._get(client, operation_name, kwargs, lambda: getattr(client, operation_name)(**kwargs))
+
+    def paginate(self, client: botocore.client.BaseClient, operation_name: str, result_key: str, **kwargs) -> typing.List[typing.Any]:
+        """Return every item of a paginated listing, which is only requested once per sweep unless invalidated."""
+        return self._get(client, f'{operation_name}:{result_key}', kwargs, lambda: list(paginate(client, operation_name, result_key, **kwargs)))
+
+    def invalidate(self, client: botocore.client.BaseClient) -> None:
+        """Forget the results of every listing of the endpoint used by the client, after a resource there has been changed."""
+        with self._lock:
+            for key in [key for key in self._locks if key[0] == client.meta.endpoint_url]:
+                self._results.pop(key, None)
+                del self._locks[key]
+
+    def _get(self, client: botocore.client.BaseClient, operation_name: str, kwargs: typing.Dict[str, typing.Any], fetch: typing.Callable[[], T]) -> T:
+        # keyed by endpoint rather than service name, since some services share an API, such as RDS and Neptune
+        key = (client.meta.endpoint_url, operation_name, json.dumps(kwargs, sort_keys=True, default=str))
+
+        with self._lock:
+            lock = self._locks.setdefault(key, threading.Lock())
+
+        # concurrent callers wait for the first one, instead of making the same request
+        with lock:
+            with self._lock:
+                if key in self._results:
+                    return self._results[key]
+
+            result = fetch()
+
+            with self._lock:
+                # a result fetched while the listing was invalidated may already be out of date
+                if self._locks.get(key) is lock:
+                    self._results[key] = result
+
+        return result
@@ -0,0 +1,11 @@
+"""Definitions shared by the terminator package and its internal modules."""
+
+import logging
+import threading
+
+logger = logging.getLogger('cleanup')
+
+AWS_REGION = 'us-east-1'
+
+# the terminator type being processed by the current thread, used to attribute API calls
+_current = threading.local()
@@ -0,0 +1,116 @@
+"""Client-side request rate limits shared by the pooled clients."""
+
+import threading
+import time
+import typing
+
+import botocore.client
+
+from ._common import logger
+
+# client-side request rate limits per (service, operation), in requests per second, applied separately in each region since that is how AWS applies them
+RATE_LIMITS = {
+    # https://docs.aws.amazon.com/ses/latest/APIReference/API_ListReceiptRuleSets.html
+    ('ses', 'ListReceiptRuleSets'): 1.0,
+    # every WAF classic change requires a change token, which is issued one at a time
+    ('waf', 'GetChangeToken'): 1.0,
+    ('waf', 'GetChangeTokenStatus'): 1.0,
+}
+# the rate assigned to operations without a declared limit once they are throttled
+RATE_LIMIT_THROTTLED = 10.0
+RATE_LIMIT_MINIMUM = 0.1
+THROTTLING_ERROR_CODES = frozenset((
+    'BandwidthLimitExceeded',
+    'EC2ThrottledException',
+    'LimitExceededException',
+    'PriorRequestNotComplete',
+    'ProvisionedThroughputExceededException',
+    'RequestLimitExceeded',
+    'RequestThrottled',
+    'RequestThrottledException',
+    'SlowDown',
+    'Throttling',
+    'ThrottlingException',
+    'TooManyRequestsException',
+))
+
+
+class TokenBucket:
+    """Token bucket rate limiter with a rate that is halved when throttled and recovers additively."""
+    def __init__(self, rate: float, max_rate: typing.Optional[float] = None):
+        self.rate = rate
+        self.max_rate = max_rate
+        self._tokens = 1.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(1.0, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # tokens are reserved even when not yet available, so waiting callers are served in order
+            self._tokens -= 1.0
+            delay = -self._tokens / self.rate
+
+        if delay > 0:
+            time.sleep(delay)
+
+    def throttled(self) -> None:
+        with self._lock:
+            self.rate = max(RATE_LIMIT_MINIMUM, self.rate / 2)
+
+    def succeeded(self) -> None:
+        with self._lock:
+            # additive increase of one request per second for every second's worth of successful requests
+            self.rate += 1 / self.rate
+
+            if self.max_rate:
+                self.rate = min(self.max_rate, self.rate)
+
+
+class RateGovernor:
+    """Client-side request rate limits shared by all pooled clients, adjusted when requests are throttled."""
+    def __init__(self, limits: typing.Dict[typing.Tuple[str, str], float]):
+        self.limits = limits
+        self._buckets: typing.Dict[typing.Tuple[str, str, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def register(self, client: botocore.client.BaseClient) -> None:
+        service_name = client.meta.service_model.service_name
+        region_name = client.meta.region_name
+
+        def before_send(event_name: str, **_kwargs) -> None:
+            bucket = self._get_bucket(service_name, event_name.rsplit('.', 1)[-1], region_name)
+
+            if bucket:
+                bucket.acquire()
+
+        def needs_retry(response: typing.Optional[typing.Tuple[typing.Any, typing.Dict[str, typing.Any]]], operation: typing.Any, **_kwargs) -> None:
+            if response and response[1].get('Error', {}).get('Code') in THROTTLING_ERROR_CODES:
+                self._get_bucket(service_name, operation.name, region_name, create=True).throttled()
+                logger.debug('throttled %s.%s in %s', service_name, operation.name, region_name)
+
+        def after_call(http_response: typing.Any, model: typing.Any, **_kwargs) -> None:
+            bucket = self._get_bucket(service_name, model.name, region_name)
+
+            if bucket and http_response.status_code < 400:
+                bucket.succeeded()
+
+        # before-send is emitted for every attempt, so retries are also rate limited
+        client.meta.events.register('before-send', before_send)
+        client.meta.events.register('needs-retry', needs_retry)
+        client.meta.events.register('after-call', after_call)
+
+    def _get_bucket(self, service_name: str, operation_name: str, region_name: str, create: bool = False) -> typing.Optional[TokenBucket]:
+        limit_key = (service_name, operation_name)
+        key = (service_name, operation_name, region_name)
+
+        with self._lock:
+            bucket = self._buckets.get(key)
+
+            if bucket is None and (create or limit_key in self.limits):
+                limit = self.limits.get(limit_key)
+                bucket = self._buckets[key] = TokenBucket(limit or RATE_LIMIT_THROTTLED, limit)
+
+        return bucket
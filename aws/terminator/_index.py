@@ -0,0 +1,816 @@
+# This file is generated by generate_index.py, do not edit it by hand.
+# Run "python generate_index.py" in the aws directory after adding, removing or changing terminator types.
+
+TERMINATORS = {
+    'ACMCertificate': {
+        'module': 'security_services',
+        'service': 'acm',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'ApiGatewayRestApi': {
+        'module': 'networking',
+        'service': 'apigateway',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'AutoScalingGroup': {
+        'module': 'compute',
+        'service': 'autoscaling',
+        'dependencies': ('Ec2Instance', 'Ec2Subnet', 'LaunchConfiguration', 'LaunchTemplate'),
+        'global_resource': False,
+    },
+    'BackupPlan': {
+        'module': 'storage_services',
+        'service': 'backup',
+        'dependencies': ('BackupVault',),
+        'global_resource': False,
+    },
+    'BackupSelection': {
+        'module': 'storage_services',
+        'service': 'backup',
+        'dependencies': ('BackupPlan',),
+        'global_resource': False,
+    },
+    'BackupVault': {
+        'module': 'storage_services',
+        'service': 'backup',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'BedrockAgent': {
+        'module': 'paas',
+        'service': 'bedrock-agent',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'CloudFrontCachePolicy': {
+        'module': 'paas',
+        'service': 'cloudfront',
+        'dependencies': (),
+        'global_resource': True,
+    },
+    'CloudFrontDistribution': {
+        'module': 'paas',
+        'service': 'cloudfront',
+        'dependencies': (
+            'CloudFrontCachePolicy',
+            'CloudFrontOriginAccessIdentity',
+            'CloudFrontOriginRequestPolicy',
+            'CloudfrontWafV2WebAcl',
+        ),
+        'global_resource': True,
+    },
+    'CloudFrontOriginAccessIdentity': {
+        'module': 'paas',
+        'service': 'cloudfront',
+        'dependencies': (),
+        'global_resource': True,
+    },
+    'CloudFrontOriginRequestPolicy': {
+        'module': 'paas',
+        'service': 'cloudfront',
+        'dependencies': (),
+        'global_resource': True,
+    },
+    'CloudFrontStreamingDistribution': {
+        'module': 'paas',
+        'service': 'cloudfront',
+        'dependencies': ('CloudFrontOriginAccessIdentity',),
+        'global_resource': True,
+    },
+    'CloudWatchAlarm': {
+        'module': 'application_services',
+        'service': 'cloudwatch',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'CloudWatchLogGroup': {
+        'module': 'application_services',
+        'service': 'logs',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'Cloudformation': {
+        'module': 'application_services',
+        'service': 'cloudformation',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'CloudfrontWafV2IpSet': {
+        'module': 'application_security',
+        'service': 'wafv2',
+        'dependencies': (),
+        'global_resource': True,
+    },
+    'CloudfrontWafV2RuleGroup': {
+        'module': 'application_security',
+        'service': 'wafv2',
+        'dependencies': ('CloudfrontWafV2IpSet',),
+        'global_resource': True,
+    },
+    'CloudfrontWafV2WebAcl': {
+        'module': 'application_security',
+        'service': 'wafv2',
+        'dependencies': ('CloudfrontWafV2IpSet', 'CloudfrontWafV2RuleGroup'),
+        'global_resource': True,
+    },
+    'CodeBuild': {
+        'module': 'application_services',
+        'service': 'codebuild',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'CodeCommitRepository': {
+        'module': 'application_services',
+        'service': 'codecommit',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'CodePipeline': {
+        'module': 'application_services',
+        'service': 'codepipeline',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'DhcpOptionsSet': {
+        'module': 'networking',
+        'service': 'ec2',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'DmsSubnetGroup': {
+        'module': 'data_services',
+        'service': 'dms',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'DynamoDb': {
+        'module': 'application_services',
+        'service': 'dynamodb',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'Ec2CustomerGateway': {
+        'module': 'networking',
+        'service': 'ec2',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'Ec2EgressInternetGateway': {
+        'module': 'networking',
+        'service': 'ec2',
+        'dependencies': ('Ec2Vpc',),
+        'global_resource': False,
+    },
+    'Ec2Eip': {
+        'module': 'networking',
+        'service': 'ec2',
+        'dependencies': ('Ec2InternetGateway',),
+        'global_resource': False,
+    },
+    'Ec2Eni': {
+        'module': 'networking',
+        'service': 'ec2',
+        'dependencies': ('Ec2SecurityGroup', 'Ec2Subnet'),
+        'global_resource': False,
+    },
+    'Ec2Image': {
+        'module': 'compute',
+        'service': 'ec2',
+        'dependencies': ('Ec2Snapshot',),
+        'global_resource': False,
+    },
+    'Ec2Instance': {
+        'module': 'compute',
+        'service': 'ec2',
+        'dependencies': ('Ec2Eip', 'Ec2PlacementGroup', 'Ec2SecurityGroup', 'Ec2Subnet', 'Ec2Volume'),
+        'global_resource': False,
+    },
+    'Ec2InternetGateway': {
+        'module': 'networking',
+        'service': 'ec2',
+        'dependencies': ('Ec2Vpc',),
+        'global_resource': False,
+    },
+    'Ec2KeyPair': {
+        'module': 'compute',
+        'service': 'ec2',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'Ec2LoadBalancer': {
+        'module': 'compute',
+        'service': 'elb',
+        'dependencies': ('Ec2SecurityGroup', 'Ec2Subnet'),
+        'global_resource': False,
+    },
+    'Ec2NatGateway': {
+        'module': 'networking',
+        'service': 'ec2',
+        'dependencies': ('Ec2Eip', 'Ec2Subnet'),
+        'global_resource': False,
+    },
+    'Ec2NetworkAcl': {
+        'module': 'networking',
+        'service': 'ec2',
+        'dependencies': ('Ec2Vpc',),
+        'global_resource': False,
+    },
+    'Ec2PlacementGroup': {
+        'module': 'compute',
+        'service': 'ec2',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'Ec2RouteTable': {
+        'module': 'networking',
+        'service': 'ec2',
+        'dependencies': ('Ec2Vpc',),
+        'global_resource': False,
+    },
+    'Ec2SecurityGroup': {
+        'module': 'networking',
+        'service': 'ec2',
+        'dependencies': ('Ec2Vpc',),
+        'global_resource': False,
+    },
+    'Ec2Snapshot': {
+        'module': 'compute',
+        'service': 'ec2',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'Ec2SpotInstanceRequest': {
+        'module': 'compute',
+        'service': 'ec2',
+        'dependencies': ('Ec2Instance',),
+        'global_resource': False,
+    },
+    'Ec2Subnet': {
+        'module': 'networking',
+        'service': 'ec2',
+        'dependencies': ('Ec2NetworkAcl', 'Ec2Vpc'),
+        'global_resource': False,
+    },
+    'Ec2TransitGateway': {
+        'module': 'compute',
+        'service': 'ec2',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'Ec2TransitGatewayAttachment': {
+        'module': 'compute',
+        'service': 'ec2',
+        'dependencies': ('Ec2Subnet', 'Ec2TransitGateway', 'Ec2Vpc'),
+        'global_resource': False,
+    },
+    'Ec2Volume': {
+        'module': 'compute',
+        'service': 'ec2',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'Ec2Vpc': {
+        'module': 'networking',
+        'service': 'ec2',
+        'dependencies': ('DhcpOptionsSet',),
+        'global_resource': False,
+    },
+    'Ec2VpcEndpoint': {
+        'module': 'networking',
+        'service': 'ec2',
+        'dependencies': ('Ec2RouteTable', 'Ec2SecurityGroup', 'Ec2Subnet', 'Ec2Vpc'),
+        'global_resource': False,
+    },
+    'Ec2VpcPeer': {
+        'module': 'networking',
+        'service': 'ec2',
+        'dependencies': ('Ec2Vpc',),
+        'global_resource': False,
+    },
+    'Ec2VpnConnection': {
+        'module': 'networking',
+        'service': 'ec2',
+        'dependencies': ('Ec2CustomerGateway', 'Ec2TransitGateway', 'Ec2VpnGateway'),
+        'global_resource': False,
+    },
+    'Ec2VpnGateway': {
+        'module': 'networking',
+        'service': 'ec2',
+        'dependencies': ('Ec2Vpc',),
+        'global_resource': False,
+    },
+    'EcrRepository': {
+        'module': 'compute',
+        'service': 'ecr',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'Ecs': {
+        'module': 'paas',
+        'service': 'ecs',
+        'dependencies': ('EcsCluster',),
+        'global_resource': False,
+    },
+    'EcsCluster': {
+        'module': 'paas',
+        'service': 'ecs',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'Efs': {
+        'module': 'application_services',
+        'service': 'efs',
+        'dependencies': ('Ec2SecurityGroup', 'Ec2Subnet'),
+        'global_resource': False,
+    },
+    'EksCluster': {
+        'module': 'compute',
+        'service': 'eks',
+        'dependencies': ('Ec2SecurityGroup', 'Ec2Subnet'),
+        'global_resource': False,
+    },
+    'EksFargateProfile': {
+        'module': 'compute',
+        'service': 'eks',
+        'dependencies': ('EksCluster',),
+        'global_resource': False,
+    },
+    'EksNodegroup': {
+        'module': 'compute',
+        'service': 'eks',
+        'dependencies': ('EksCluster', 'LaunchTemplate'),
+        'global_resource': False,
+    },
+    'ElasticBeanstalk': {
+        'module': 'compute',
+        'service': 'elasticbeanstalk',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'ElasticLoadBalancing': {
+        'module': 'compute',
+        'service': 'elb',
+        'dependencies': ('Ec2SecurityGroup', 'Ec2Subnet'),
+        'global_resource': False,
+    },
+    'ElasticLoadBalancingv2': {
+        'module': 'compute',
+        'service': 'elbv2',
+        'dependencies': ('Ec2SecurityGroup', 'Ec2Subnet', 'Elbv2TargetGroups'),
+        'global_resource': False,
+    },
+    'Elasticache': {
+        'module': 'data_services',
+        'service': 'elasticache',
+        'dependencies': ('Ec2SecurityGroup',),
+        'global_resource': False,
+    },
+    'Elbv2TargetGroups': {
+        'module': 'compute',
+        'service': 'elbv2',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'Glacier': {
+        'module': 'data_services',
+        'service': 'glacier',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'GlueConnection': {
+        'module': 'data_services',
+        'service': 'glue',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'GlueCrawler': {
+        'module': 'data_services',
+        'service': 'glue',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'GlueJob': {
+        'module': 'data_services',
+        'service': 'glue',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'IAMSamlProvider': {
+        'module': 'security_services',
+        'service': 'iam',
+        'dependencies': (),
+        'global_resource': True,
+    },
+    'IamInstanceProfile': {
+        'module': 'security_services',
+        'service': 'iam',
+        'dependencies': ('IamRole',),
+        'global_resource': True,
+    },
+    'IamRole': {
+        'module': 'security_services',
+        'service': 'iam',
+        'dependencies': (),
+        'global_resource': True,
+    },
+    'IamServerCertificate': {
+        'module': 'security_services',
+        'service': 'iam',
+        'dependencies': (),
+        'global_resource': True,
+    },
+    'InspectorAssessmentTarget': {
+        'module': 'application_security',
+        'service': 'inspector',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'InspectorAssessmentTemplate': {
+        'module': 'application_security',
+        'service': 'inspector',
+        'dependencies': ('InspectorAssessmentTarget',),
+        'global_resource': False,
+    },
+    'KMSKey': {
+        'module': 'security_services',
+        'service': 'kms',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'KafkaCluster': {
+        'module': 'data_services',
+        'service': 'kafka',
+        'dependencies': ('Ec2SecurityGroup', 'Ec2Subnet', 'KafkaConfiguration'),
+        'global_resource': False,
+    },
+    'KafkaConfiguration': {
+        'module': 'data_services',
+        'service': 'kafka',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'KinesisStream': {
+        'module': 'application_services',
+        'service': 'kinesis',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'LambdaEventSourceMapping': {
+        'module': 'paas',
+        'service': 'lambda',
+        'dependencies': ('DynamoDb', 'KinesisStream', 'LambdaFunction', 'MqBroker', 'SqsQueue'),
+        'global_resource': False,
+    },
+    'LambdaFunction': {
+        'module': 'compute',
+        'service': 'lambda',
+        'dependencies': ('Ec2SecurityGroup', 'Ec2Subnet'),
+        'global_resource': False,
+    },
+    'LambdaLayers': {
+        'module': 'paas',
+        'service': 'lambda',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'LaunchConfiguration': {
+        'module': 'compute',
+        'service': 'autoscaling',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'LaunchTemplate': {
+        'module': 'compute',
+        'service': 'ec2',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'Lightsail': {
+        'module': 'compute',
+        'service': 'lightsail',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'LightsailInstanceSnapshot': {
+        'module': 'compute',
+        'service': 'lightsail',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'LightsailKeyPair': {
+        'module': 'compute',
+        'service': 'lightsail',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'LightsailStaticIp': {
+        'module': 'compute',
+        'service': 'lightsail',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'MemoryDBACLs': {
+        'module': 'storage_services',
+        'service': 'memorydb',
+        'dependencies': ('MemoryDBUsers',),
+        'global_resource': False,
+    },
+    'MemoryDBClusters': {
+        'module': 'storage_services',
+        'service': 'memorydb',
+        'dependencies': ('Ec2SecurityGroup', 'MemoryDBACLs', 'MemoryDBParameterGroups', 'MemoryDBSubnetGroups'),
+        'global_resource': False,
+    },
+    'MemoryDBParameterGroups': {
+        'module': 'storage_services',
+        'service': 'memorydb',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'MemoryDBSnapshots': {
+        'module': 'storage_services',
+        'service': 'memorydb',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'MemoryDBSubnetGroups': {
+        'module': 'storage_services',
+        'service': 'memorydb',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'MemoryDBUsers': {
+        'module': 'storage_services',
+        'service': 'memorydb',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'MqBroker': {
+        'module': 'application_services',
+        'service': 'mq',
+        'dependencies': ('Ec2SecurityGroup', 'Ec2Subnet'),
+        'global_resource': False,
+    },
+    'NeptuneCluster': {
+        'module': 'compute',
+        'service': 'neptune',
+        'dependencies': ('Ec2SecurityGroup', 'NeptuneSubnetGroup'),
+        'global_resource': False,
+    },
+    'NeptuneSubnetGroup': {
+        'module': 'compute',
+        'service': 'neptune',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'NetworkFirewall': {
+        'module': 'networking',
+        'service': 'network-firewall',
+        'dependencies': ('Ec2Subnet', 'Ec2Vpc', 'NetworkFirewallPolicy'),
+        'global_resource': False,
+    },
+    'NetworkFirewallPolicy': {
+        'module': 'networking',
+        'service': 'network-firewall',
+        'dependencies': ('NetworkFirewallRuleGroup',),
+        'global_resource': False,
+    },
+    'NetworkFirewallRuleGroup': {
+        'module': 'networking',
+        'service': 'network-firewall',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'RdsDbCluster': {
+        'module': 'data_services',
+        'service': 'rds',
+        'dependencies': ('Ec2SecurityGroup', 'RdsDbClusterParameterGroup'),
+        'global_resource': False,
+    },
+    'RdsDbClusterParameterGroup': {
+        'module': 'data_services',
+        'service': 'rds',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'RdsDbClusterSnapshot': {
+        'module': 'data_services',
+        'service': 'rds',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'RdsDbInstance': {
+        'module': 'data_services',
+        'service': 'rds',
+        'dependencies': ('Ec2SecurityGroup', 'RdsDbCluster', 'RdsDbParameterGroup', 'RdsOptionGroup'),
+        'global_resource': False,
+    },
+    'RdsDbParameterGroup': {
+        'module': 'data_services',
+        'service': 'rds',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'RdsDbSnapshot': {
+        'module': 'data_services',
+        'service': 'rds',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'RdsOptionGroup': {
+        'module': 'data_services',
+        'service': 'rds',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'RedshiftCluster': {
+        'module': 'data_services',
+        'service': 'redshift',
+        'dependencies': ('Ec2SecurityGroup', 'RedshiftSubnetGroup'),
+        'global_resource': False,
+    },
+    'RedshiftSubnetGroup': {
+        'module': 'data_services',
+        'service': 'redshift',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'RegionalWafV2IpSet': {
+        'module': 'application_security',
+        'service': 'wafv2',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'RegionalWafV2RuleGroup': {
+        'module': 'application_security',
+        'service': 'wafv2',
+        'dependencies': ('RegionalWafV2IpSet',),
+        'global_resource': False,
+    },
+    'RegionalWafV2WebAcl': {
+        'module': 'application_security',
+        'service': 'wafv2',
+        'dependencies': ('RegionalWafV2IpSet', 'RegionalWafV2RuleGroup'),
+        'global_resource': False,
+    },
+    'Route53HealthCheck': {
+        'module': 'networking',
+        'service': 'route53',
+        'dependencies': (),
+        'global_resource': True,
+    },
+    'Route53HostedZone': {
+        'module': 'networking',
+        'service': 'route53',
+        'dependencies': ('Route53HealthCheck',),
+        'global_resource': True,
+    },
+    'S3AccessPoint': {
+        'module': 'storage_services',
+        'service': 's3control',
+        'dependencies': ('S3Bucket',),
+        'global_resource': False,
+    },
+    'S3AccessPointForObjectLambda': {
+        'module': 'storage_services',
+        'service': 's3control',
+        'dependencies': ('LambdaFunction', 'S3AccessPoint'),
+        'global_resource': False,
+    },
+    'S3Bucket': {
+        'module': 'storage_services',
+        'service': 's3',
+        'dependencies': (),
+        'global_resource': True,
+    },
+    'SSMBucketObjects': {
+        'module': 'storage_services',
+        'service': 's3',
+        'dependencies': (),
+        'global_resource': True,
+    },
+    'Secret': {
+        'module': 'security_services',
+        'service': 'secretsmanager',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'SesIdentity': {
+        'module': 'application_services',
+        'service': 'ses',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'SesReceiptRuleSet': {
+        'module': 'application_services',
+        'service': 'ses',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'Sns': {
+        'module': 'application_services',
+        'service': 'sns',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'SqsQueue': {
+        'module': 'application_services',
+        'service': 'sqs',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'SsmDocument': {
+        'module': 'application_services',
+        'service': 'ssm',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'SsmParameter': {
+        'module': 'application_services',
+        'service': 'ssm',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'SsmSession': {
+        'module': 'application_services',
+        'service': 'ssm',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'StepFunctions': {
+        'module': 'application_services',
+        'service': 'stepfunctions',
+        'dependencies': (),
+        'global_resource': False,
+    },
+    'WafByteMatchSet': {
+        'module': 'application_security',
+        'service': 'waf',
+        'dependencies': (),
+        'global_resource': True,
+    },
+    'WafGeoMatchSet': {
+        'module': 'application_security',
+        'service': 'waf',
+        'dependencies': (),
+        'global_resource': True,
+    },
+    'WafIpSet': {
+        'module': 'application_security',
+        'service': 'waf',
+        'dependencies': (),
+        'global_resource': True,
+    },
+    'WafRegexMatchSet': {
+        'module': 'application_security',
+        'service': 'waf',
+        'dependencies': ('WafRegexPatternSet',),
+        'global_resource': True,
+    },
+    'WafRegexPatternSet': {
+        'module': 'application_security',
+        'service': 'waf',
+        'dependencies': (),
+        'global_resource': True,
+    },
+    'WafRule': {
+        'module': 'application_security',
+        'service': 'waf',
+        'dependencies': (
+            'WafByteMatchSet',
+            'WafGeoMatchSet',
+            'WafIpSet',
+            'WafRegexMatchSet',
+            'WafSizeConstraintSet',
+            'WafSqlInjectionMatchSet',
+            'WafXssMatchSet',
+        ),
+        'global_resource': True,
+    },
+    'WafSizeConstraintSet': {
+        'module': 'application_security',
+        'service': 'waf',
+        'dependencies': (),
+        'global_resource': True,
+    },
+    'WafSqlInjectionMatchSet': {
+        'module': 'application_security',
+        'service': 'waf',
+        'dependencies': (),
+        'global_resource': True,
+    },
+    'WafWebAcl': {
+        'module': 'application_security',
+        'service': 'waf',
+        'dependencies': ('WafRule',),
+        'global_resource': True,
+    },
+    'WafXssMatchSet': {
+        'module': 'application_security',
+        'service': 'waf',
+        'dependencies': (),
+        'global_resource': True,
+    },
+}
@@ -0,0 +1,345 @@
+"""DynamoDB key/value store used to track the age of resources and the progress of sweeps."""
+
+import concurrent.futures
+import contextlib
+import threading
+import time
+import typing
+
+from queue import Queue
+
+from boto3.dynamodb.conditions import Attr
+import boto3
+import botocore.exceptions
+
+from ._common import AWS_REGION, logger
+
+# DynamoDB BatchWriteItem accepts at most 25 requests
+KVS_BATCH_SIZE = 25
+KVS_BATCH_ATTEMPTS = 5
+KVS_BATCH_BACKOFF = 0.1  # seconds, doubled after each attempt
+KVS_SCAN_SEGMENTS = 4
+
+
+class KeyValueStore:
+    """ DynamoDB data store for the AWS terminator """
+    primary_key = 'id'
+    # numeric attribute holding the time after which an entry may be purged, for entries which are written with one
+    expiry_key = 'expires'
+
+    def __init__(self, domain_name: typing.Optional[str] = None, value_name: str = 'created_time'):
+        self.domain_name = domain_name
+        self.table = None
+        self.value_name = value_name
+        self.snapshot: typing.Optional[typing.Dict[str, str]] = None
+        self.loaded: typing.Optional[float] = None
+        self._pending: typing.Dict[str, typing.Dict[str, typing.Any]] = {}
+        self._lock = threading.Lock()
+
+    def initialize(self) -> None:
+        """Deferred initialization of the DynamoDB database."""
+        if self.table is not None:
+            return
+
+        table = boto3.resource('dynamodb', region_name=AWS_REGION).Table(self.domain_name)
+
+        try:
+            if table.table_status == 'DELETING':
+                table.wait_until_not_exists()
+                self.create_table(table)
+        except botocore.exceptions.ClientError as ex:
+            if ex.response['Error']['Code'] == 'ResourceNotFoundException':
+                self.create_table(table)
+            else:
+                raise ex
+
+        # the table is only used once it exists
+        self.table = table
+
+    def load(self) -> None:
+        """Load all tracked keys so lookups during the sweep do not require a request per resource."""
+        self.initialize()
+
+        snapshot = {}
+
+        with contextlib.closing(self.scan(KVS_SCAN_SEGMENTS, ProjectionExpression=f'{self.primary_key}, {self.value_name}')) as pages:
+            for page in pages:
+                for item in page:
+                    snapshot[item[self.primary_key]] = item.get(self.value_name)
+
+        with self._lock:
+            # changes which have not been flushed yet are missing from the table, so they are applied to the snapshot
+            for key, request in self._pending.items():
+                if 'DeleteRequest' in request:
+                    snapshot.pop(key, None)
+                elif 'Put' in request:
+                    snapshot.setdefault(key, request['Put']['Item'][self.value_name])
+                else:
+                    snapshot[key] = request['PutRequest']['Item'][self.value_name]
+
+            self.snapshot = snapshot
+            self.loaded = time.monotonic()
+
+        logger.debug('loaded key/value store: count=%d', len(snapshot))
+
+    def reset(self, domain_name: typing.Optional[str] = None) -> None:
+        """Discard the table and snapshot kept between runs, optionally switching to another table, so they are looked up again when next used."""
+        with self._lock:
+            if domain_name and domain_name != self.domain_name:
+                # buffered changes belong to the previous table
+                self._pending.clear()
+                self.domain_name = domain_name
+
+            self.table = None
+            self.snapshot = None
+            self.loaded = None
+
+    def scan(self, segments: int = 1, **scan_options: typing.Any) -> typing.Iterator[typing.List[typing.Dict[str, typing.Any]]]:
+        """Yield pages of items from a complete scan, using a parallel scan when more than one segment is requested."""
+        self.initialize()
+
+        if segments <= 1:
+            yield from self._scan_segment(scan_options)
+            return
+
+        pages: Queue = Queue()
+        stop = threading.Event()
+
+        def scan_segment(segment: int) -> None:
+            try:
+                for page in self._scan_segment(dict(scan_options, Segment=segment, TotalSegments=segments)):
+                    if stop.is_set():
+                        return
+
+                    pages.put(page)
+            finally:
+                pages.put(None)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=segments, thread_name_prefix='kvs-scan') as executor:
+            futures = [executor.submit(scan_segment, segment) for segment in range(segments)]
+            remaining = segments
+
+            try:
+                while remaining:
+                    page = pages.get()
+
+                    if page is None:
+                        remaining -= 1
+                    else:
+                        yield page
+            finally:
+                stop.set()
+
+        for future in futures:
+            future.result()
+
+    def _scan_segment(self, scan_options: typing.Dict[str, typing.Any]) -> typing.Iterator[typing.List[typing.Dict[str, typing.Any]]]:
+        while True:
+            # the client is used directly since it is thread safe, unlike the table resource
+            result = self.table.meta.client.scan(TableName=self.domain_name, **scan_options)
+
+            yield result.get('Items', [])
+
+            if 'LastEvaluatedKey' not in result:
+                return
+
+            scan_options = dict(scan_options, ExclusiveStartKey=result['LastEvaluatedKey'])
+
+    def flush(self) -> None:
+        """Write all buffered changes using batched requests, except first-seen entries which are written one at a time with a condition."""
+        count = 0
+
+        while True:
+            with self._lock:
+                requests = [self._pending.pop(key) for key in list(self._pending)[:KVS_BATCH_SIZE]]
+
+            if not requests:
+                break
+
+            batch = [request for request in requests if 'Put' not in request]
+
+            if batch:
+                try:
+                    self._batch_write(batch)
+                except botocore.exceptions.ClientError:
+                    # a single invalid request, such as an item which is too large, fails the whole batch, so each one is written on its own
+                    logger.warning('exception writing %d key/value store changes, writing them individually', len(batch), exc_info=True)
+
+                    for request in batch:
+                        self._write(request)
+
+            for request in requests:
+                if 'Put' in request:
+                    self._write(request)
+
+            count += len(requests)
+
+        if count:
+            logger.debug('flushed key/value store: count=%d', count)
+
+    def _buffer(self, key: str, request: typing.Dict[str, typing.Any]) -> None:
+        with self._lock:
+            # a later change to the same key replaces the earlier one, which also keeps keys unique within a batch
+            self._pending[key] = request
+            full = len(self._pending) >= KVS_BATCH_SIZE
+
+        if full:
+            self.flush()
+
+    def _batch_write(self, requests: typing.List[typing.Dict[str, typing.Any]]) -> None:
+        self.initialize()
+
+        request_items = {self.domain_name: requests}
+
+        for attempt in range(KVS_BATCH_ATTEMPTS):
+            if attempt:
+                time.sleep(KVS_BATCH_BACKOFF * 2 ** (attempt - 1))
+
+            request_items = self.table.meta.client.batch_write_item(RequestItems=request_items).get('UnprocessedItems')
+
+            if not request_items:
+                return
+
+        unprocessed = request_items[self.domain_name]
+
+        logger.warning('unable to write key/value store changes, will retry on next flush: count=%d', len(unprocessed))
+
+        with self._lock:
+            for request in unprocessed:
+                self._pending.setdefault(self._get_key(request), request)
+
+    def _write(self, request: typing.Dict[str, typing.Any]) -> None:
+        """Write a single buffered change, logging instead of raising if it fails."""
+        self.initialize()
+
+        client = self.table.meta.client
+
+        try:
+            if 'PutRequest' in request:
+                client.put_item(TableName=self.domain_name, **request['PutRequest'])
+            elif 'DeleteRequest' in request:
+                client.delete_item(TableName=self.domain_name, **request['DeleteRequest'])
+            else:
+                self._put_first_seen(request['Put'])
+        except botocore.exceptions.ClientError:
+            logger.exception('exception writing key/value store entry: %s', self._get_key(request))
+
+    def _put_first_seen(self, put: typing.Dict[str, typing.Any]) -> None:
+        key = put['Item'][self.primary_key]
+
+        try:
+            self.table.meta.client.put_item(TableName=self.domain_name, **put)
+        except botocore.exceptions.ClientError as ex:
+            if ex.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+
+            # the entry was written after the snapshot was loaded, such as by another run, so the snapshot takes the stored value instead
+            item = self.table.meta.client.get_item(TableName=self.domain_name, Key={self.primary_key: key}, ConsistentRead=True).get('Item', {})
+
+            with self._lock:
+                if self.snapshot is not None and item:
+                    self.snapshot[key] = item.get(self.value_name)
+
+    def _get_key(self, request: typing.Dict[str, typing.Any]) -> str:
+        if 'DeleteRequest' in request:
+            return request['DeleteRequest']['Key'][self.primary_key]
+
+        return (request.get('PutRequest') or request['Put'])['Item'][self.primary_key]
+
+    def put(self, key: str, value: str, expires: typing.Optional[float] = None) -> None:
+        """Buffer an unconditional write of the given entry, optionally with the time after which it may be purged."""
+        with self._lock:
+            if self.snapshot is not None:
+                self.snapshot[key] = value
+
+        item = {
+            self.primary_key: key,
+            self.value_name: value,
+        }
+
+        if expires is not None:
+            item[self.expiry_key] = int(expires)
+
+        self._buffer(key, {'PutRequest': {'Item': item}})
+
+    def get(self, key: str) -> str:
+        with self._lock:
+            if self.snapshot is not None:
+                return self.snapshot.get(key)
+
+        self.initialize()
+
+        item = self.table.get_item(
+            Key={self.primary_key: key},
+            ProjectionExpression=self.value_name,
+        ).get('Item', {})
+
+        return item.get(self.value_name)
+
+    def find(self, prefixes: typing.Tuple[str, ...]) -> typing.Dict[str, str]:
+        """Return all entries whose key starts with one of the given prefixes, loading all tracked keys first if they are not loaded yet."""
+        with self._lock:
+            snapshot = self.snapshot
+
+        if snapshot is None:
+            # a single scan of the table serves every later lookup, instead of a scan for each one
+            self.load()
+
+        with self._lock:
+            return {key: value for key, value in self.snapshot.items() if key.startswith(prefixes)}
+
+    def set(self, key: str, value: str) -> None:
+        """Record a first-seen entry without replacing an existing one."""
+        with self._lock:
+            snapshot = self.snapshot
+
+        # Don't replace an existing entry
+        expression = Attr(self.primary_key).ne(key)
+
+        attributes = {
+            self.primary_key: key,
+            self.value_name: value,
+        }
+
+        if snapshot is not None:
+            # The snapshot may have been loaded by an earlier run, so entries missing from it are still written with the condition, when flushed.
+            if key not in snapshot:
+                with self._lock:
+                    snapshot[key] = value
+
+                self._buffer(key, {'Put': {'Item': attributes, 'ConditionExpression': expression}})
+
+            return
+
+        self.initialize()
+
+        self.table.put_item(
+            Item=attributes,
+            ConditionExpression=expression,
+        )
+
+    def create_table(self, table: typing.Any) -> None:
+        """Creates a new DynamoDB database."""
+        table.meta.client.create_table(
+            TableName=self.domain_name,
+            AttributeDefinitions=[{
+                'AttributeName': self.primary_key,
+                'AttributeType': 'S'
+            }],
+            KeySchema=[{
+                'AttributeName': self.primary_key,
+                'KeyType': 'HASH'
+            }],
+            BillingMode='PAY_PER_REQUEST',
+        )
+        table.wait_until_exists()
+
+    def delete(self, key: str) -> None:
+        """Buffer the deletion of the given entry."""
+        with self._lock:
+            if self.snapshot is not None:
+                self.snapshot.pop(key, None)
+
+        self._buffer(key, {'DeleteRequest': {'Key': {
+            self.primary_key: key,
+        }}})
@@ -0,0 +1,118 @@
+"""Statistics of the AWS API calls made by the pooled clients."""
+
+import json
+import time
+import threading
+import typing
+
+import botocore.client
+
+from ._common import _current, logger
+
+# API metrics are written in CloudWatch embedded metric format, which accepts at most 100 values per metric
+METRICS_NAMESPACE = 'AwsTerminator'
+METRICS_MAX_VALUES = 100
+
+
+class ApiMetrics:
+    """Latency, retry and response size statistics per (service, operation, terminator type), collected from all pooled clients."""
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+        self._stats: typing.Dict[typing.Tuple[str, str, str], typing.Dict[str, typing.Any]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, client: botocore.client.BaseClient) -> None:
+        service_name = client.meta.service_model.service_name
+
+        def before_call(model: typing.Any, context: typing.Dict[str, typing.Any], **_kwargs) -> None:
+            # before-call and after-call are emitted once per call, so the latency includes retries and rate limiting
+            context['metrics'] = (service_name, model.name, getattr(_current, 'terminator_type', None) or '-', time.monotonic())
+
+        def after_call(http_response: typing.Any, parsed: typing.Dict[str, typing.Any], model: typing.Any, context: typing.Dict[str, typing.Any],
+                       **_kwargs) -> None:
+            size = http_response.headers.get('content-length')
+
+            # reading the content of a streaming response would consume it before the caller does
+            if size is None and not model.has_streaming_output:
+                size = len(http_response.content)
+
+            size = int(size or 0)
+            retries = parsed.get('ResponseMetadata', {}).get('RetryAttempts', 0)
+            self._record(context, http_response.status_code >= 300, retries, size)
+
+        def after_call_error(context: typing.Dict[str, typing.Any], **_kwargs) -> None:
+            self._record(context, True, 0, 0)
+
+        client.meta.events.register('before-call', before_call)
+        client.meta.events.register('after-call', after_call)
+        client.meta.events.register('after-call-error', after_call_error)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def _record(self, context: typing.Dict[str, typing.Any], error: bool, retries: int, size: int) -> None:
+        if 'metrics' not in context:
+            return
+
+        service_name, operation_name, type_name, start = context.pop('metrics')
+        latency = (time.monotonic() - start) * 1000
+
+        with self._lock:
+            stats = self._stats.setdefault((service_name, operation_name, type_name), {'latency': [], 'errors': 0, 'retries': 0, 'bytes': 0})
+            stats['latency'].append(latency)
+            stats['errors'] += error
+            stats['retries'] += retries
+            stats['bytes'] += size
+
+    def get_stats(self) -> typing.Dict[typing.Tuple[str, str, str], typing.Dict[str, typing.Any]]:
+        with self._lock:
+            return {key: dict(value, latency=list(value['latency'])) for key, value in self._stats.items()}
+
+    def write_emf(self, stream: typing.TextIO) -> None:
+        """Write one CloudWatch embedded metric format line per (service, operation, type), plus one per additional set of latency values."""
+        timestamp = int(time.time() * 1000)
+
+        for (service_name, operation_name, type_name), stats in sorted(self.get_stats().items()):
+            for index in range(0, len(stats['latency']), METRICS_MAX_VALUES):
+                definitions = [{'Name': 'Latency', 'Unit': 'Milliseconds'}]
+                record = {
+                    'Service': service_name,
+                    'Operation': operation_name,
+                    'Type': type_name,
+                    'Latency': [round(value, 1) for value in stats['latency'][index:index + METRICS_MAX_VALUES]],
+                }
+
+                # counters are only written once, so they are not repeated along with the extra latency values
+                if not index:
+                    definitions += [{'Name': 'Calls', 'Unit': 'Count'}, {'Name': 'Errors', 'Unit': 'Count'}, {'Name': 'Retries', 'Unit': 'Count'},
+                                    {'Name': 'ResponseSize', 'Unit': 'Bytes'}]
+                    record.update(Calls=len(stats['latency']), Errors=stats['errors'], Retries=stats['retries'], ResponseSize=stats['bytes'])
+
+                record['_aws'] = {
+                    'Timestamp': timestamp,
+                    'CloudWatchMetrics': [{
+                        'Namespace': self.namespace,
+                        'Dimensions': [['Service', 'Operation'], ['Type']],
+                        'Metrics': definitions,
+                    }],
+                }
+
+                stream.write(json.dumps(record, sort_keys=True) + '\n')
+
+        stream.flush()
+
+    def log_summary(self) -> None:
+        """Log a table of the collected statistics, ordered by the total time spent on each operation."""
+        stats = sorted(self.get_stats().items(), key=lambda item: sum(item[1]['latency']), reverse=True)
+
+        if not stats:
+            return
+
+        row = '%-20s %-40s %-32s %6s %6s %7s %10s %8s %8s %8s %9s'
+        logger.debug(row, 'service', 'operation', 'type', 'calls', 'errors', 'retries', 'bytes', 'p50 ms', 'p90 ms', 'max ms', 'total s')
+
+        for (service_name, operation_name, type_name), value in stats:
+            latency = sorted(value['latency'])
+            logger.debug(row, service_name, operation_name, type_name, len(latency), value['errors'], value['retries'], value['bytes'],
+                         f'{latency[len(latency) // 2]:.0f}', f'{latency[len(latency) * 9 // 10]:.0f}', f'{latency[-1]:.0f}', f'{sum(latency) / 1000:.1f}')
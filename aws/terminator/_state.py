@@ -0,0 +1,193 @@
+"""Progress of sweeps, kept so later runs can skip or resume work."""
+
+import datetime
+import json
+import math
+import time
+import typing
+
+from ._common import logger
+from ._kvs import KeyValueStore
+
+if typing.TYPE_CHECKING:
+    from . import Terminator
+
+# a partially completed sweep is resumed by later runs, unless it was started more than this many seconds ago
+SWEEP_CURSOR_AGE = 60 * 60
+
+# seconds before a resource which could not be terminated is tried again, doubled after each failed attempt up to the maximum
+RETRY_BACKOFF = 5 * 60
+RETRY_BACKOFF_MAX = 4 * 60 * 60
+
+# sweep state which is not written again for this many seconds is purged, such as that of removed types or regions, or of buckets deleted elsewhere
+STATE_EXPIRY = 24 * 60 * 60
+
+
+# The sweep state only lets later runs skip or resume work, so errors reading or writing it are logged instead of stopping the sweep.
+def get_state(key: str) -> typing.Dict[str, typing.Any]:
+    """Return the sweep state stored under the given key, or an empty dict if there is none."""
+    # noinspection PyBroadException
+    try:
+        value = state.get(key)
+        return json.loads(value) if value else {}
+    except Exception:  # pylint: disable=broad-except
+        logger.exception('exception reading sweep state: %s', key)
+        return {}
+
+
+def set_state(key: str, value: typing.Dict[str, typing.Any], expires: typing.Optional[float] = None) -> None:
+    """Store the sweep state under the given key, until it expires at the given time or STATE_EXPIRY seconds after it was written."""
+    # noinspection PyBroadException
+    try:
+        state.put(key, json.dumps(value, sort_keys=True), time.time() + STATE_EXPIRY if expires is None else expires)
+    except Exception:  # pylint: disable=broad-except
+        logger.exception('exception writing sweep state: %s', key)
+
+
+def find_state(*prefixes: str) -> typing.Dict[str, typing.Dict[str, typing.Any]]:
+    """Return the sweep state stored under every key starting with one of the given prefixes."""
+    # noinspection PyBroadException
+    try:
+        return {key: json.loads(value) for key, value in state.find(prefixes).items() if value}
+    except Exception:  # pylint: disable=broad-except
+        logger.exception('exception reading sweep state: %s', ', '.join(f'{prefix}*' for prefix in prefixes))
+        return {}
+
+
+def clear_state(key: str) -> None:
+    # noinspection PyBroadException
+    try:
+        state.delete(key)
+    except Exception:  # pylint: disable=broad-except
+        logger.exception('exception clearing sweep state: %s', key)
+
+
+class TerminationHistory:
+    """Earlier terminations of a terminator type in a region.
+
+    Tombstones mark resources which were terminated and may still be listed while their deletion completes.
+    Retries record resources which could not be terminated, with the error and the time after which they are tried again.
+    Each one is kept as a separate state entry, since a type can have more of them than fit in a single entry.
+    Both are dropped once a resource is no longer listed, and purged with the rest of the sweep state once they expire.
+    """
+    def __init__(self, name: str, region: str, ttl: datetime.timedelta):
+        self.now = time.time()
+        self.ttl = ttl.total_seconds()
+        self._suffix = f'{name}:{region}:'
+        tombstones, retries = self._find('tombstone', 'retry')
+        self._previous_tombstones = {key: value['expires'] for key, value in tombstones.items()}
+        self._previous_retries = retries
+        self._retries: typing.Dict[str, typing.Dict[str, typing.Any]] = {}
+        self._listed: typing.Set[str] = set()
+
+    @staticmethod
+    def has_due_retries(stats: typing.Dict[str, typing.Any]) -> bool:
+        return stats.get('retry_due', math.inf) <= time.time()
+
+    @staticmethod
+    def get_key(instance: 'Terminator') -> str:
+        return str(instance.id or instance.name)
+
+    def _find(self, *kinds: str) -> typing.List[typing.Dict[str, typing.Dict[str, typing.Any]]]:
+        """Return the entries of each kind, keyed by resource, looking them all up at once."""
+        prefixes = [f'{kind}:{self._suffix}' for kind in kinds]
+        entries = find_state(*prefixes)
+        return [{key[len(prefix):]: value for key, value in entries.items() if key.startswith(prefix)} for prefix in prefixes]
+
+    def listed(self, instance: 'Terminator') -> None:
+        """Record that the instance is still listed, so what is known about it is kept."""
+        self._listed.add(self.get_key(instance))
+
+    def get_status(self, instance: 'Terminator', force: bool = False) -> typing.Optional[str]:
+        """Return the status of an instance which is not to be terminated yet, or None if it can be terminated. Forcing termination skips the backoff."""
+        key = self.get_key(instance)
+
+        if self._previous_tombstones.get(key, 0) > self.now:
+            return 'deleting'
+
+        if not force and key in self._previous_retries and self._previous_retries[key]['next'] > self.now:
+            return 'backoff'
+
+        return None
+
+    def terminated(self, instance: 'Terminator') -> None:
+        key = self.get_key(instance)
+        self._retries.pop(key, None)
+
+        if self._previous_retries.pop(key, None) is not None:
+            clear_state(f'retry:{self._suffix}{key}')
+
+        # an earlier tombstone is replaced, or removed if tombstones are not kept for the type
+        previous = self._previous_tombstones.pop(key, None)
+
+        if self.ttl > 0:
+            expires = time.time() + self.ttl
+            set_state(f'tombstone:{self._suffix}{key}', {'expires': expires}, expires)
+        elif previous is not None:
+            clear_state(f'tombstone:{self._suffix}{key}')
+
+    def failed(self, instance: 'Terminator', error_code: str) -> None:
+        key = self.get_key(instance)
+        attempts = self._previous_retries.get(key, {}).get('attempts', 0) + 1
+
+        self._retries[key] = {
+            'error': error_code,
+            'attempts': attempts,
+            'next': time.time() + min(RETRY_BACKOFF * 2 ** (attempts - 1), RETRY_BACKOFF_MAX),
+        }
+
+        set_state(f'retry:{self._suffix}{key}', self._retries[key])
+
+    def save(self, listed: bool) -> typing.Dict[str, typing.Any]:
+        """Remove expired tombstones, and entries of resources no longer listed unless the listing did not complete.
+
+        Returns when the earliest retry which is kept is due, to keep with the state of the type.
+        """
+        for key, expires in self._previous_tombstones.items():
+            if expires <= self.now or (listed and key not in self._listed):
+                clear_state(f'tombstone:{self._suffix}{key}')
+
+        retries = dict(self._retries)
+
+        for key, retry in self._previous_retries.items():
+            if key in retries:
+                continue
+
+            if listed and key not in self._listed:
+                clear_state(f'retry:{self._suffix}{key}')
+            else:
+                retries[key] = retry
+
+        if not retries:
+            return {}
+
+        return {'retry_due': min(retry['next'] for retry in retries.values())}
+
+
+class SweepCursor:
+    """Progress of a sweep through the terminator types of a region, persisted so a run which is cut short can be resumed by the next."""
+    def __init__(self, region: str, names: typing.List[str]):
+        self.key = f'sweep:{region}'
+        self.names = set(names)
+
+        cursor = get_state(self.key)
+
+        if cursor and time.time() - cursor['started'] < SWEEP_CURSOR_AGE:
+            self.started = cursor['started']
+            self.completed = set(cursor['completed']) & self.names
+            logger.info('resuming sweep of %s: completed=%d, remaining=%d', region, len(self.completed), len(self.names - self.completed))
+        else:
+            self.started = time.time()
+            self.completed = set()
+
+    def update(self, names: typing.Iterable[str]) -> None:
+        """Record the given types as completed, starting over once every type has been completed."""
+        self.completed.update(names)
+
+        if self.completed >= self.names:
+            clear_state(self.key)
+        else:
+            set_state(self.key, {'started': self.started, 'completed': sorted(self.completed)})
+
+
+state = KeyValueStore(value_name='state_json')
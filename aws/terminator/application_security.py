@@ -1,10 +1,12 @@
 import abc
 import datetime
 
-from . import DbTerminator, Terminator
+from . import DbTerminator, Terminator, paginate
 
 
 class Waf(DbTerminator):
+    global_resource = True
+
     @property
     def age_limit(self):
         return datetime.timedelta(minutes=30)
@@ -23,15 +25,12 @@ class Waf(DbTerminator):
 
 
 class WafWebAcl(Waf):
+    dependencies = ('WafRule',)
+
     @staticmethod
     def create(credentials):
         return Terminator._create(credentials, WafWebAcl, 'waf', lambda client: client.list_web_acls()['WebACLs'])
 
-    @property
-    def age_limit(self):
-        # Try to delete WafWebAcl first, because WafRule objects cannot be deleted if used in any WebACL
-        return datetime.timedelta(minutes=20)
-
     @property
     def id(self):
         return self.instance['WebACLId']
@@ -45,6 +44,8 @@ class WafWebAcl(Waf):
 
 
 class WafRule(Waf):
+    dependencies = ('WafByteMatchSet', 'WafGeoMatchSet', 'WafIpSet', 'WafRegexMatchSet', 'WafSizeConstraintSet', 'WafSqlInjectionMatchSet', 'WafXssMatchSet')
+
     @staticmethod
     def create(credentials):
         return Terminator._create(credentials, WafRule, 'waf', lambda client: client.list_rules()['Rules'])
@@ -164,6 +165,8 @@ class WafByteMatchSet(Waf):
 
 
 class WafRegexMatchSet(Waf):
+    dependencies = ('WafRegexPatternSet',)
+
     @staticmethod
     def create(credentials):
         return Terminator._create(credentials, WafRegexMatchSet, 'waf', lambda client: client.list_regex_match_sets()['RegexMatchSets'])
@@ -198,6 +201,8 @@ class WafRegexPatternSet(Waf):
 
 
 class WafV2(DbTerminator):
+    record_fields = ('LockToken', 'Scope')
+
     @property
     def id(self):
         return self.instance['Id']
@@ -229,6 +234,8 @@ class RegionalWafV2IpSet(WafV2):
 
 
 class CloudfrontWafV2IpSet(WafV2):
+    global_resource = True
+
     @staticmethod
     def create(credentials):
         return DbTerminator._create(credentials, CloudfrontWafV2IpSet, 'wafv2', lambda client: client.list_ip_sets(Scope='CLOUDFRONT')['IPSets'])
@@ -238,6 +245,8 @@ class CloudfrontWafV2IpSet(WafV2):
 
 
 class RegionalWafV2RuleGroup(WafV2):
+    dependencies = ('RegionalWafV2IpSet',)
+
     @staticmethod
     def create(credentials):
         return DbTerminator._create(credentials, RegionalWafV2RuleGroup, 'wafv2', lambda client: client.list_rule_groups(Scope='REGIONAL')['RuleGroups'])
@@ -247,6 +256,9 @@ class RegionalWafV2RuleGroup(WafV2):
 
 
 class CloudfrontWafV2RuleGroup(WafV2):
+    dependencies = ('CloudfrontWafV2IpSet',)
+    global_resource = True
+
     @staticmethod
     def create(credentials):
         return DbTerminator._create(credentials, CloudfrontWafV2RuleGroup, 'wafv2', lambda client: client.list_rule_groups(Scope='CLOUDFRONT')['RuleGroups'])
@@ -256,6 +268,8 @@ class CloudfrontWafV2RuleGroup(WafV2):
 
 
 class RegionalWafV2WebAcl(WafV2):
+    dependencies = ('RegionalWafV2IpSet', 'RegionalWafV2RuleGroup')
+
     @staticmethod
     def create(credentials):
         return DbTerminator._create(credentials, RegionalWafV2WebAcl, 'wafv2', lambda client: client.list_web_acls(Scope='REGIONAL')['WebACLs'])
@@ -265,6 +279,9 @@ class RegionalWafV2WebAcl(WafV2):
 
 
 class CloudfrontWafV2WebAcl(WafV2):
+    dependencies = ('CloudfrontWafV2IpSet', 'CloudfrontWafV2RuleGroup')
+    global_resource = True
+
     @staticmethod
     def create(credentials):
         return DbTerminator._create(credentials, CloudfrontWafV2WebAcl, 'wafv2', lambda client: client.list_web_acls(Scope='CLOUDFRONT')['WebACLs'])
@@ -274,11 +291,13 @@ class CloudfrontWafV2WebAcl(WafV2):
 
 
 class InspectorAssessmentTemplate(DbTerminator):
+    dependencies = ('InspectorAssessmentTarget',)
+
     @staticmethod
     def create(credentials):
         return Terminator._create(
             credentials, InspectorAssessmentTemplate, 'inspector',
-            lambda client: client.get_paginator('list_assessment_templates').paginate().build_full_result()['assessmentTemplateArns']
+            lambda client: paginate(client, 'list_assessment_templates', 'assessmentTemplateArns')
         )
 
     @property
@@ -298,7 +317,7 @@ class InspectorAssessmentTarget(DbTerminator):
     def create(credentials):
         return Terminator._create(
             credentials, InspectorAssessmentTarget, 'inspector',
-            lambda client: client.get_paginator('list_assessment_targets').paginate().build_full_result()['assessmentTargetArns']
+            lambda client: paginate(client, 'list_assessment_targets', 'assessmentTargetArns')
         )
 
     @property
@@ -1,14 +1,13 @@
 from datetime import timezone, datetime
-import time
 
-from . import DbTerminator, Terminator
+from . import DbTerminator, Terminator, paginate
 
 
 class Cloudformation(Terminator):
     @staticmethod
     def create(credentials):
         def paginate_stacks(client):
-            return client.get_paginator('describe_stacks').paginate().build_full_result()['Stacks']
+            return paginate(client, 'describe_stacks', 'Stacks')
 
         return Terminator._create(credentials, Cloudformation, 'cloudformation', paginate_stacks)
 
@@ -77,14 +76,14 @@ class CodeBuild(Terminator):
         return self.instance['name']
 
     def terminate(self):
-        self.client.delete_project(name=self.instance['name'])
+        self.client.delete_project(name=self.name)
 
 
 class CodeCommitRepository(DbTerminator):
     @staticmethod
     def create(credentials):
         def paginate_repositories(client):
-            return client.get_paginator('list_repositories').paginate().build_full_result()['repositories']
+            return paginate(client, 'list_repositories', 'repositories')
 
         return Terminator._create(credentials, CodeCommitRepository, 'codecommit', paginate_repositories)
 
@@ -125,6 +124,8 @@ class CodePipeline(Terminator):
 
 
 class Efs(Terminator):
+    dependencies = ('Ec2SecurityGroup', 'Ec2Subnet')
+
     @staticmethod
     def create(credentials):
         return Terminator._create(credentials, Efs, 'efs', lambda client: client.describe_file_systems()['FileSystems'])
@@ -152,18 +153,8 @@ class KinesisStream(Terminator):
     @staticmethod
     def create(credentials):
         def paginate_streams(client):
-            names = client.get_paginator('list_streams').paginate(
-                PaginationConfig={
-                    'PageSize': 100,
-                }
-            ).build_full_result()['StreamNames']
-
-            if not names:
-                return []
-
-            return [
-                client.describe_stream(StreamName=n)['StreamDescription'] for n in names
-            ]
+            # the stream summaries hold everything needed, so each stream does not need to be described
+            return paginate(client, 'list_streams', 'StreamSummaries', PaginationConfig={'PageSize': 100})
 
         return Terminator._create(credentials, KinesisStream, 'kinesis', paginate_streams)
 
@@ -185,7 +176,7 @@ class KinesisStream(Terminator):
 
     def terminate(self):
         self.client.delete_stream(
-            StreamName=self.instance['StreamName'],
+            StreamName=self.name,
             EnforceConsumerDeletion=True
         )
 
@@ -215,11 +206,9 @@ class SesReceiptRuleSet(Terminator):
             results = client.list_receipt_rule_sets()
             next_token = results.pop('NextToken', None)
             while next_token:
-                # This operation can be made at most once/second, see
-                # https://boto3.readthedocs.io/en/latest/reference/services/ses.html#SES.Client.list_receipt_rule_sets
-                time.sleep(1)
+                # This operation can be made at most once/second, which is enforced by RATE_LIMITS
                 next_rule_sets = client.list_receipt_rule_sets(NextToken=next_token)
-                results['RuleSets'].append(next_rule_sets['RuleSets'])
+                results['RuleSets'].extend(next_rule_sets['RuleSets'])
                 next_token = next_rule_sets.pop('NextToken', None)
             return results['RuleSets']
         return Terminator._create(credentials, SesReceiptRuleSet, 'ses', _paginate_receipt_rule_sets)
@@ -271,6 +260,8 @@ class SqsQueue(DbTerminator):
 
 
 class SsmParameter(DbTerminator):
+    batch_size = 10
+
     @staticmethod
     def create(credentials):
         return Terminator._create(credentials, SsmParameter, 'ssm', lambda client: client.describe_parameters()['Parameters'])
@@ -286,6 +277,12 @@ class SsmParameter(DbTerminator):
     def terminate(self):
         self.client.delete_parameter(Name=self.id)
 
+    @staticmethod
+    def terminate_batch(instances):
+        parameters = {instance.id: instance for instance in instances}
+        result = instances[0].client.delete_parameters(Names=list(parameters))
+        return {parameters[name]: 'ParameterNotFound' for name in result.get('InvalidParameters', [])}
+
 
 class DynamoDb(DbTerminator):
 
@@ -293,8 +290,7 @@ class DynamoDb(DbTerminator):
     def create(credentials):
 
         def get_tables(client):
-            table_names = client.get_paginator(
-                'list_tables').paginate().build_full_result().get('TableNames', ())
+            table_names = paginate(client, 'list_tables', 'TableNames')
             return table_names
 
         return Terminator._create(credentials, DynamoDb, 'dynamodb', get_tables)
@@ -308,7 +304,7 @@ class DynamoDb(DbTerminator):
         return self.instance
 
     def terminate(self):
-        return self.client.delete_table(TableName=self.instance)
+        return self.client.delete_table(TableName=self.name)
 
 
 class StepFunctions(Terminator):
@@ -316,8 +312,7 @@ class StepFunctions(Terminator):
     def create(credentials):
 
         def get_state_machines(client):
-            state_machines = client.get_paginator(
-                'list_state_machines').paginate().build_full_result().get('stateMachines', [])
+            state_machines = paginate(client, 'list_state_machines', 'stateMachines')
             return state_machines
 
         return Terminator._create(credentials, StepFunctions, 'stepfunctions', get_state_machines)
@@ -335,6 +330,8 @@ class StepFunctions(Terminator):
 
 
 class CloudWatchAlarm(DbTerminator):
+    batch_size = 100
+
     @staticmethod
     def create(credentials):
         return Terminator._create(credentials, CloudWatchAlarm, 'cloudwatch', lambda client: client.describe_alarms()['MetricAlarms'])
@@ -346,13 +343,17 @@ class CloudWatchAlarm(DbTerminator):
     def terminate(self):
         self.client.delete_alarms(AlarmNames=[self.name])
 
+    @staticmethod
+    def terminate_batch(instances):
+        instances[0].client.delete_alarms(AlarmNames=[instance.name for instance in instances])
+        return {}
+
 
 class SsmDocument(Terminator):
     @staticmethod
     def create(credentials):
         def get_ssm_documents(client):
-            ssm_documents = client.get_paginator(
-                'list_documents').paginate(Filters=[{'Key': 'Owner', 'Values': ['self']}]).build_full_result().get('DocumentIdentifiers', [])
+            ssm_documents = paginate(client, 'list_documents', 'DocumentIdentifiers', Filters=[{'Key': 'Owner', 'Values': ['self']}])
             return ssm_documents
 
         return Terminator._create(credentials, SsmDocument, 'ssm', get_ssm_documents)
@@ -373,8 +374,7 @@ class SsmSession(Terminator):
     @staticmethod
     def create(credentials):
         def get_ssm_sessions(client):
-            ssm_sessions = client.get_paginator(
-                'describe_sessions').paginate(State='Active').build_full_result().get('Sessions', [])
+            ssm_sessions = paginate(client, 'describe_sessions', 'Sessions', State='Active')
             return ssm_sessions
 
         return Terminator._create(credentials, SsmSession, 'ssm', get_ssm_sessions)
@@ -396,11 +396,12 @@ class SsmSession(Terminator):
 
 
 class MqBroker(Terminator):
+    dependencies = ('Ec2SecurityGroup', 'Ec2Subnet')
+
     @staticmethod
     def create(credentials):
         def get_mq_brokers(client):
-            mq_brokers = client.get_paginator(
-                'list_brokers').paginate().build_full_result().get('BrokerSummaries', [])
+            mq_brokers = paginate(client, 'list_brokers', 'BrokerSummaries')
             return mq_brokers
 
         return Terminator._create(credentials, MqBroker, 'mq', get_mq_brokers)
@@ -4,7 +4,7 @@ import botocore
 import botocore.exceptions
 import dateutil.tz
 
-from . import DbTerminator, Terminator, get_tag_dict_from_tag_list, get_account_id
+from . import DbTerminator, Terminator, describe_cache, describe_concurrently, get_tag_dict_from_tag_list, get_account_id, paginate
 
 
 class Ec2KeyPair(DbTerminator):
@@ -21,9 +21,12 @@ class Ec2KeyPair(DbTerminator):
 
 
 class Ec2LoadBalancer(Terminator):
+    dependencies = ('Ec2SecurityGroup', 'Ec2Subnet')
+
     @staticmethod
     def create(credentials):
-        return Terminator._create(credentials, Ec2LoadBalancer, 'elb', lambda client: client.describe_load_balancers()['LoadBalancerDescriptions'])
+        return Terminator._create(credentials, Ec2LoadBalancer, 'elb',
+                                  lambda client: describe_cache.paginate(client, 'describe_load_balancers', 'LoadBalancerDescriptions'))
 
     @property
     def name(self):
@@ -38,10 +41,14 @@ class Ec2LoadBalancer(Terminator):
 
 
 class Ec2Instance(Terminator):
+    dependencies = ('Ec2Eip', 'Ec2PlacementGroup', 'Ec2SecurityGroup', 'Ec2Subnet', 'Ec2Volume')
+    batch_size = 1000
+    describe_filter = {'Filters': [{'Name': 'instance-state-name', 'Values': ['pending', 'running', 'shutting-down', 'stopping', 'stopped']}]}
+
     @staticmethod
     def create(credentials):
         return Terminator._create(credentials, Ec2Instance, 'ec2',
-                                  lambda client: [i for r in client.describe_instances()['Reservations'] for i in r['Instances']])
+                                  lambda client, **kwargs: [i for r in client.describe_instances(**kwargs)['Reservations'] for i in r['Instances']])
 
     @property
     def id(self):
@@ -70,6 +77,12 @@ class Ec2Instance(Terminator):
         self.client.modify_instance_attribute(InstanceId=self.id, Attribute='disableApiTermination', Value='False')
         self.client.terminate_instances(InstanceIds=[self.id])
 
+    @staticmethod
+    def terminate_batch(instances):
+        # an instance with termination protection fails the whole request, after which each instance is terminated individually
+        instances[0].client.terminate_instances(InstanceIds=[instance.id for instance in instances])
+        return {}
+
 
 class Ec2Snapshot(Terminator):
     @staticmethod
@@ -94,6 +107,8 @@ class Ec2Snapshot(Terminator):
 
 
 class Ec2Image(Terminator):
+    dependencies = ('Ec2Snapshot',)
+
     @staticmethod
     def create(credentials):
         account = get_account_id(credentials)
@@ -197,6 +212,9 @@ class Ec2TransitGateway(Terminator):
 
 
 class Ec2TransitGatewayAttachment(Terminator):
+    dependencies = ('Ec2Subnet', 'Ec2TransitGateway', 'Ec2Vpc')
+    record_fields = ('ResourceType',)
+
     @staticmethod
     def create(credentials):
         account = get_account_id(credentials)
@@ -261,7 +279,7 @@ class NeptuneSubnetGroup(DbTerminator):
     @staticmethod
     def create(credentials):
         def _paginate_neptune_subnet_groups(client):
-            return client.get_paginator('describe_db_subnet_groups').paginate().build_full_result()['DBSubnetGroups']
+            return paginate(client, 'describe_db_subnet_groups', 'DBSubnetGroups')
         return Terminator._create(credentials, NeptuneSubnetGroup, 'neptune', _paginate_neptune_subnet_groups)
 
     @property
@@ -298,6 +316,8 @@ class EcrRepository(Terminator):
 
 
 class LambdaFunction(Terminator):
+    dependencies = ('Ec2SecurityGroup', 'Ec2Subnet')
+
     @staticmethod
     def create(credentials):
         return Terminator._create(credentials, LambdaFunction, 'lambda', lambda client: client.list_functions()['Functions'])
@@ -316,16 +336,13 @@ class LambdaFunction(Terminator):
 
 
 class NeptuneCluster(Terminator):
+    dependencies = ('Ec2SecurityGroup', 'NeptuneSubnetGroup')
+
     @staticmethod
     def create(credentials):
         def _paginate_neptune_clusters(client):
-            results = client.describe_db_clusters()
-            marker = results.pop('Marker', None)
-            while marker is not None:
-                next_clusters = client.describe_db_clusters(Marker=marker)
-                results['DBClusters'].append(next_clusters['DBClusters'])
-                marker = next_clusters.pop('Marker', None)
-            return results['DBClusters']
+            # Neptune shares the RDS API, so this listing is shared with RdsDbCluster
+            return describe_cache.paginate(client, 'describe_db_clusters', 'DBClusters')
         return Terminator._create(credentials, NeptuneCluster, 'neptune', _paginate_neptune_clusters)
 
     @property
@@ -341,14 +358,14 @@ class NeptuneCluster(Terminator):
 
 
 class EksCluster(Terminator):
+    dependencies = ('Ec2SecurityGroup', 'Ec2Subnet')
+
     @staticmethod
     def create(credentials):
         def _build_cluster_results(client):
-            cluster_list = client.list_clusters()['clusters']
-            results = []
-            for cluster in cluster_list:
-                results.append(client.describe_cluster(name=cluster)['cluster'])
-            return results
+            cluster_list = describe_cache.paginate(client, 'list_clusters', 'clusters')
+            # there is no bulk describe call for EKS clusters, so they are described concurrently
+            return describe_concurrently(lambda cluster: client.describe_cluster(name=cluster)['cluster'], cluster_list)
         return Terminator._create(credentials, EksCluster, 'eks', _build_cluster_results)
 
     @property
@@ -372,14 +389,22 @@ class EksCluster(Terminator):
 
 
 class EksFargateProfile(Terminator):
+    dependencies = ('EksCluster',)
+    record_fields = ('clusterName',)
+
     @staticmethod
     def create(credentials):
         def _build_eks_fargate_profiles(client):
-            results = []
-            for cluster in client.list_clusters()['clusters']:
-                for fargate_profile in client.list_fargate_profiles(clusterName=cluster)['fargateProfileNames']:
-                    results.append(client.describe_fargate_profile(clusterName=cluster, fargateProfileName=fargate_profile)['fargateProfile'])
-            return results
+            def list_profiles(cluster):
+                return [(cluster, name) for name in paginate(client, 'list_fargate_profiles', 'fargateProfileNames', clusterName=cluster)]
+
+            def describe_profile(profile):
+                return client.describe_fargate_profile(clusterName=profile[0], fargateProfileName=profile[1])['fargateProfile']
+
+            # there are no bulk describe calls for EKS, so the clusters and then their profiles are described concurrently
+            clusters = describe_cache.paginate(client, 'list_clusters', 'clusters')
+            profiles = [profile for cluster_profiles in describe_concurrently(list_profiles, clusters) for profile in cluster_profiles]
+            return describe_concurrently(describe_profile, profiles)
         return Terminator._create(credentials, EksFargateProfile, 'eks', _build_eks_fargate_profiles)
 
     @property
@@ -411,14 +436,22 @@ class EksFargateProfile(Terminator):
 
 
 class EksNodegroup(Terminator):
+    dependencies = ('EksCluster', 'LaunchTemplate')
+    record_fields = ('clusterName',)
+
     @staticmethod
     def create(credentials):
         def _build_eks_nodgroups(client):
-            results = []
-            for cluster in client.list_clusters()['clusters']:
-                for nodegroup in client.list_nodegroups(clusterName=cluster)['nodegroups']:
-                    results.append(client.describe_nodegroup(clusterName=cluster, nodegroupName=nodegroup)['nodegroup'])
-            return results
+            def list_nodegroups(cluster):
+                return [(cluster, name) for name in paginate(client, 'list_nodegroups', 'nodegroups', clusterName=cluster)]
+
+            def describe_nodegroup(nodegroup):
+                return client.describe_nodegroup(clusterName=nodegroup[0], nodegroupName=nodegroup[1])['nodegroup']
+
+            # there are no bulk describe calls for EKS, so the clusters and then their node groups are described concurrently
+            clusters = describe_cache.paginate(client, 'list_clusters', 'clusters')
+            nodegroups = [nodegroup for cluster_nodegroups in describe_concurrently(list_nodegroups, clusters) for nodegroup in cluster_nodegroups]
+            return describe_concurrently(describe_nodegroup, nodegroups)
         return Terminator._create(credentials, EksNodegroup, 'eks', _build_eks_nodgroups)
 
     @property
@@ -450,11 +483,12 @@ class EksNodegroup(Terminator):
 
 
 class ElasticLoadBalancing(Terminator):
+    dependencies = ('Ec2SecurityGroup', 'Ec2Subnet')
+
     @staticmethod
     def create(credentials):
         def _paginate_elastic_lbs(client):
-            return client.get_paginator(
-                'describe_load_balancers').paginate().build_full_result()['LoadBalancerDescriptions']
+            return describe_cache.paginate(client, 'describe_load_balancers', 'LoadBalancerDescriptions')
         return Terminator._create(credentials, ElasticLoadBalancing, 'elb', _paginate_elastic_lbs)
 
     @property
@@ -470,11 +504,12 @@ class ElasticLoadBalancing(Terminator):
 
 
 class ElasticLoadBalancingv2(Terminator):
+    dependencies = ('Ec2SecurityGroup', 'Ec2Subnet', 'Elbv2TargetGroups')
+
     @staticmethod
     def create(credentials):
         def _paginate_elastic_lbs(client):
-            return client.get_paginator(
-                'describe_load_balancers').paginate().build_full_result()['LoadBalancers']
+            return paginate(client, 'describe_load_balancers', 'LoadBalancers')
         return Terminator._create(credentials, ElasticLoadBalancingv2, 'elbv2', _paginate_elastic_lbs)
 
     @property
@@ -503,8 +538,7 @@ class Elbv2TargetGroups(DbTerminator):
     @staticmethod
     def create(credentials):
         def _paginate_target_groups(client):
-            return client.get_paginator(
-                'describe_target_groups').paginate().build_full_result()['TargetGroups']
+            return paginate(client, 'describe_target_groups', 'TargetGroups')
         return Terminator._create(credentials, Elbv2TargetGroups, 'elbv2', _paginate_target_groups)
 
     @property
@@ -527,7 +561,7 @@ class Lightsail(Terminator):
     @staticmethod
     def create(credentials):
         def _paginate_lightsail_instances(client):
-            return client.get_paginator('get_instances').paginate().build_full_result()['instances']
+            return paginate(client, 'get_instances', 'instances')
         return Terminator._create(credentials, Lightsail, 'lightsail', _paginate_lightsail_instances)
 
     @property
@@ -546,7 +580,7 @@ class LightsailKeyPair(Terminator):
     @staticmethod
     def create(credentials):
         def _paginate_lightsail_key_pairs(client):
-            return client.get_paginator('get_key_pairs').paginate().build_full_result()['keyPairs']
+            return paginate(client, 'get_key_pairs', 'keyPairs')
         return Terminator._create(credentials, LightsailKeyPair, 'lightsail', _paginate_lightsail_key_pairs)
 
     @property
@@ -565,7 +599,7 @@ class LightsailStaticIp(Terminator):
     @staticmethod
     def create(credentials):
         def _paginate_lightsail_static_ips(client):
-            return client.get_paginator('get_static_ips').paginate().build_full_result()['staticIps']
+            return paginate(client, 'get_static_ips', 'staticIps')
         return Terminator._create(credentials, LightsailStaticIp, 'lightsail', _paginate_lightsail_static_ips)
 
     @property
@@ -584,7 +618,7 @@ class LightsailInstanceSnapshot(Terminator):
     @staticmethod
     def create(credentials):
         def _paginate_lightsail_instance_snapshots(client):
-            return client.get_paginator('get_instance_snapshots').paginate().build_full_result()['instanceSnapshots']
+            return paginate(client, 'get_instance_snapshots', 'instanceSnapshots')
         return Terminator._create(credentials, LightsailInstanceSnapshot, 'lightsail', _paginate_lightsail_instance_snapshots)
 
     @property
@@ -600,6 +634,8 @@ class LightsailInstanceSnapshot(Terminator):
 
 
 class AutoScalingGroup(Terminator):
+    dependencies = ('Ec2Instance', 'Ec2Subnet', 'LaunchConfiguration', 'LaunchTemplate')
+
     @staticmethod
     def create(credentials):
         return Terminator._create(credentials, AutoScalingGroup, 'autoscaling', lambda client: client.describe_auto_scaling_groups()['AutoScalingGroups'])
@@ -681,6 +717,8 @@ class LaunchTemplate(Terminator):
 
 
 class Ec2SpotInstanceRequest(Terminator):
+    dependencies = ('Ec2Instance',)
+
     @staticmethod
     def create(credentials):
         return Terminator._create(credentials, Ec2SpotInstanceRequest, 'ec2', lambda client: client.describe_spot_instance_requests()['SpotInstanceRequests'])
@@ -2,14 +2,14 @@ import datetime
 
 import botocore.exceptions
 
-from . import DbTerminator, Terminator, get_tag_dict_from_tag_list
+from . import DbTerminator, Terminator, describe_cache, get_tag_dict_from_tag_list, paginate
 
 
 class DmsSubnetGroup(DbTerminator):
     @staticmethod
     def create(credentials):
         def paginate_dms_subnet_groups(client):
-            return client.get_paginator('describe_replication_subnet_groups').paginate().build_full_result()['ReplicationSubnetGroups']
+            return paginate(client, 'describe_replication_subnet_groups', 'ReplicationSubnetGroups')
 
         return Terminator._create(credentials, DmsSubnetGroup, 'dms', paginate_dms_subnet_groups)
 
@@ -29,7 +29,7 @@ class RedshiftSubnetGroup(DbTerminator):
     @staticmethod
     def create(credentials):
         def paginate_redshift_subnet_groups(client):
-            return client.get_paginator('describe_cluster_subnet_groups').paginate().build_full_result()['ClusterSubnetGroups']
+            return paginate(client, 'describe_cluster_subnet_groups', 'ClusterSubnetGroups')
 
         return Terminator._create(credentials, RedshiftSubnetGroup, 'redshift', paginate_redshift_subnet_groups)
 
@@ -46,6 +46,8 @@ class RedshiftSubnetGroup(DbTerminator):
 
 
 class Elasticache(Terminator):
+    dependencies = ('Ec2SecurityGroup',)
+
     @staticmethod
     def create(credentials):
 
@@ -76,6 +78,8 @@ class Elasticache(Terminator):
 
 
 class GlueConnection(Terminator):
+    batch_size = 25
+
     @staticmethod
     def create(credentials):
         return Terminator._create(credentials, GlueConnection, 'glue', lambda client: client.get_connections()['ConnectionList'])
@@ -95,6 +99,12 @@ class GlueConnection(Terminator):
     def terminate(self):
         self.client.delete_connection(ConnectionName=self.name)
 
+    @staticmethod
+    def terminate_batch(instances):
+        connections = {instance.name: instance for instance in instances}
+        result = instances[0].client.batch_delete_connection(ConnectionNameList=list(connections))
+        return {connections[name]: error['ErrorDetail'].get('ErrorCode', 'Error') for name, error in result.get('Errors', {}).items()}
+
 
 class GlueCrawler(Terminator):
     @staticmethod
@@ -203,6 +213,8 @@ class RdsDbClusterParameterGroup(DbTerminator):
 
 
 class RdsDbInstance(DbTerminator):
+    dependencies = ('Ec2SecurityGroup', 'RdsDbCluster', 'RdsDbParameterGroup', 'RdsOptionGroup')
+
     @staticmethod
     def create(credentials):
         return Terminator._create(credentials, RdsDbInstance, 'rds', lambda client: client.describe_db_instances()['DBInstances'])
@@ -253,9 +265,11 @@ class RdsDbSnapshot(DbTerminator):
 
 
 class RdsDbCluster(Terminator):
+    dependencies = ('Ec2SecurityGroup', 'RdsDbClusterParameterGroup')
+
     @staticmethod
     def create(credentials):
-        return Terminator._create(credentials, RdsDbCluster, 'rds', lambda client: client.describe_db_clusters()['DBClusters'])
+        return Terminator._create(credentials, RdsDbCluster, 'rds', lambda client: describe_cache.paginate(client, 'describe_db_clusters', 'DBClusters'))
 
     @property
     def id(self):
@@ -301,6 +315,8 @@ class RdsDbClusterSnapshot(Terminator):
 
 
 class RedshiftCluster(Terminator):
+    dependencies = ('Ec2SecurityGroup', 'RedshiftSubnetGroup')
+
     @staticmethod
     def create(credentials):
 
@@ -376,6 +392,8 @@ class KafkaConfiguration(Terminator):
 
 
 class KafkaCluster(Terminator):
+    dependencies = ('Ec2SecurityGroup', 'Ec2Subnet', 'KafkaConfiguration')
+
     @staticmethod
     def create(credentials):
         return Terminator._create(credentials, KafkaCluster, 'kafka', lambda client: client.list_clusters()['ClusterInfoList'])
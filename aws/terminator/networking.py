@@ -4,6 +4,10 @@ from . import DbTerminator, Terminator, get_tag_dict_from_tag_list
 
 
 class Route53HostedZone(DbTerminator):
+    dependencies = ('Route53HealthCheck',)
+    global_resource = True
+    record_fields = ('Config',)
+
     @staticmethod
     def create(credentials):
         return Terminator._create(credentials, Route53HostedZone, 'route53', lambda client: client.list_hosted_zones()['HostedZones'])
@@ -58,6 +62,8 @@ class Route53HostedZone(DbTerminator):
 
 
 class Route53HealthCheck(DbTerminator):
+    global_resource = True
+
     @staticmethod
     def create(credentials):
         return Terminator._create(credentials, Route53HealthCheck, 'route53', lambda client: client.list_health_checks()['HealthChecks'])
@@ -75,6 +81,8 @@ class Route53HealthCheck(DbTerminator):
 
 
 class Ec2Eip(DbTerminator):
+    dependencies = ('Ec2InternetGateway',)
+
     @staticmethod
     def create(credentials):
         return Terminator._create(credentials, Ec2Eip, 'ec2', lambda client: client.describe_addresses()['Addresses'])
@@ -98,6 +106,8 @@ class Ec2CustomerGateway(DbTerminator):
 
     @property
     def age_limit(self):
+        # A VPN connection using the gateway takes several minutes to finish deleting after it is terminated,
+        # and the gateway cannot be deleted until then.
         return datetime.timedelta(minutes=25)
 
     @property
@@ -134,13 +144,12 @@ class DhcpOptionsSet(DbTerminator):
 
 
 class Ec2Subnet(DbTerminator):
+    dependencies = ('Ec2NetworkAcl', 'Ec2Vpc')
+    describe_filter = {'Filters': [{'Name': 'default-for-az', 'Values': ['false']}]}
+
     @staticmethod
     def create(credentials):
-        return Terminator._create(credentials, Ec2Subnet, 'ec2', lambda client: client.describe_subnets()['Subnets'])
-
-    @property
-    def age_limit(self):
-        return datetime.timedelta(minutes=25)
+        return Terminator._create(credentials, Ec2Subnet, 'ec2', lambda client, **kwargs: client.describe_subnets(**kwargs)['Subnets'])
 
     @property
     def id(self):
@@ -159,6 +168,10 @@ class Ec2Subnet(DbTerminator):
 
 
 class Ec2InternetGateway(DbTerminator):
+    __slots__ = ('_ignore',)
+    dependencies = ('Ec2Vpc',)
+    record_fields = ('Attachments',)
+
     def __init__(self, client, instance):
         self._ignore = None
         super().__init__(client, instance)
@@ -167,10 +180,6 @@ class Ec2InternetGateway(DbTerminator):
     def create(credentials):
         return Terminator._create(credentials, Ec2InternetGateway, 'ec2', lambda client: client.describe_internet_gateways()['InternetGateways'])
 
-    @property
-    def age_limit(self):
-        return datetime.timedelta(minutes=25)
-
     @property
     def id(self):
         return self.instance['InternetGatewayId']
@@ -197,6 +206,8 @@ class Ec2InternetGateway(DbTerminator):
 
 
 class Ec2EgressInternetGateway(DbTerminator):
+    dependencies = ('Ec2Vpc',)
+
     @staticmethod
     def create(credentials):
         return Terminator._create(credentials, Ec2EgressInternetGateway, 'ec2',
@@ -215,6 +226,8 @@ class Ec2EgressInternetGateway(DbTerminator):
 
 
 class Ec2NatGateway(DbTerminator):
+    dependencies = ('Ec2Eip', 'Ec2Subnet')
+
     @staticmethod
     def create(credentials):
         return Terminator._create(credentials, Ec2NatGateway, 'ec2', lambda client: client.describe_nat_gateways()['NatGateways'])
@@ -232,6 +245,8 @@ class Ec2NatGateway(DbTerminator):
 
 
 class Ec2NetworkAcl(DbTerminator):
+    dependencies = ('Ec2Vpc',)
+
     @staticmethod
     def create(credentials):
         return Terminator._create(credentials, Ec2NetworkAcl, 'ec2', lambda client: client.describe_network_acls()['NetworkAcls'])
@@ -253,14 +268,12 @@ class Ec2NetworkAcl(DbTerminator):
 
 
 class Ec2Eni(DbTerminator):
+    dependencies = ('Ec2SecurityGroup', 'Ec2Subnet')
+
     @staticmethod
     def create(credentials):
         return Terminator._create(credentials, Ec2Eni, 'ec2', lambda client: client.describe_network_interfaces()['NetworkInterfaces'])
 
-    @property
-    def age_limit(self):
-        return datetime.timedelta(minutes=25)
-
     @property
     def id(self):
         return self.instance['NetworkInterfaceId']
@@ -274,6 +287,9 @@ class Ec2Eni(DbTerminator):
 
 
 class Ec2RouteTable(DbTerminator):
+    dependencies = ('Ec2Vpc',)
+    record_fields = ('Associations',)
+
     @staticmethod
     def create(credentials):
         return Terminator._create(credentials, Ec2RouteTable, 'ec2', lambda client: client.describe_route_tables()['RouteTables'])
@@ -301,6 +317,8 @@ class Ec2RouteTable(DbTerminator):
 
 
 class Ec2VpcEndpoint(Terminator):
+    dependencies = ('Ec2RouteTable', 'Ec2SecurityGroup', 'Ec2Subnet', 'Ec2Vpc')
+
     @staticmethod
     def create(credentials):
         return Terminator._create(credentials, Ec2VpcEndpoint, 'ec2', lambda client: client.describe_vpc_endpoints()['VpcEndpoints'])
@@ -322,13 +340,12 @@ class Ec2VpcEndpoint(Terminator):
 
 
 class Ec2Vpc(DbTerminator):
+    dependencies = ('DhcpOptionsSet',)
+    describe_filter = {'Filters': [{'Name': 'is-default', 'Values': ['false']}]}
+
     @staticmethod
     def create(credentials):
-        return Terminator._create(credentials, Ec2Vpc, 'ec2', lambda client: client.describe_vpcs()['Vpcs'])
-
-    @property
-    def age_limit(self):
-        return datetime.timedelta(minutes=40)
+        return Terminator._create(credentials, Ec2Vpc, 'ec2', lambda client, **kwargs: client.describe_vpcs(**kwargs)['Vpcs'])
 
     @property
     def id(self):
@@ -347,6 +364,8 @@ class Ec2Vpc(DbTerminator):
 
 
 class Ec2VpnConnection(DbTerminator):
+    dependencies = ('Ec2CustomerGateway', 'Ec2TransitGateway', 'Ec2VpnGateway')
+
     @staticmethod
     def create(credentials):
         return Terminator._create(credentials, Ec2VpnConnection, 'ec2', lambda client: client.describe_vpn_connections()['VpnConnections'])
@@ -370,6 +389,9 @@ class Ec2VpnConnection(DbTerminator):
 
 
 class Ec2VpnGateway(DbTerminator):
+    dependencies = ('Ec2Vpc',)
+    record_fields = ('VpcAttachments',)
+
     @staticmethod
     def create(credentials):
         return Terminator._create(credentials, Ec2VpnGateway, 'ec2', lambda client: client.describe_vpn_gateways()['VpnGateways'])
@@ -400,6 +422,8 @@ class Ec2VpnGateway(DbTerminator):
 
 
 class Ec2VpcPeer(DbTerminator):
+    dependencies = ('Ec2Vpc',)
+
     @staticmethod
     def create(credentials):
         return Terminator._create(credentials, Ec2VpcPeer, 'ec2', lambda client: client.describe_vpc_peering_connections()['VpcPeeringConnections'])
@@ -423,14 +447,13 @@ class Ec2VpcPeer(DbTerminator):
 
 
 class Ec2SecurityGroup(DbTerminator):
+    dependencies = ('Ec2Vpc',)
+    record_fields = ('IpPermissions', 'IpPermissionsEgress')
+
     @staticmethod
     def create(credentials):
         return Terminator._create(credentials, Ec2SecurityGroup, 'ec2', lambda client: client.describe_security_groups()['SecurityGroups'])
 
-    @property
-    def age_limit(self):
-        return datetime.timedelta(minutes=30)
-
     @property
     def id(self):
         return self.instance['GroupId']
@@ -484,6 +507,8 @@ class ApiGatewayRestApi(Terminator):
 
 
 class NetworkFirewall(DbTerminator):
+    dependencies = ('Ec2Subnet', 'Ec2Vpc', 'NetworkFirewallPolicy')
+
     @staticmethod
     def create(credentials):
         return Terminator._create(credentials, NetworkFirewall, 'network-firewall', lambda client: client.list_firewalls()['Firewalls'])
@@ -502,6 +527,8 @@ class NetworkFirewall(DbTerminator):
 
 
 class NetworkFirewallPolicy(DbTerminator):
+    dependencies = ('NetworkFirewallRuleGroup',)
+
     @staticmethod
     def create(credentials):
         return Terminator._create(credentials, NetworkFirewallPolicy, 'network-firewall', lambda client: client.list_firewall_policies()['FirewallPolicies'])
@@ -531,7 +558,8 @@ class NetworkFirewallRuleGroup(DbTerminator):
 
     @property
     def age_limit(self):
-        return datetime.timedelta(minutes=35)
+        # Rule groups are ordered after their policies through dependencies, so they share the same age limit.
+        return datetime.timedelta(minutes=30)
 
     @property
     def id(self):
@@ -1,9 +1,11 @@
 from datetime import datetime, timedelta
 
-from . import DbTerminator, Terminator
+from . import DbTerminator, Terminator, describe_cache, paginate
 
 
 class LambdaEventSourceMapping(DbTerminator):
+    dependencies = ('DynamoDb', 'KinesisStream', 'LambdaFunction', 'MqBroker', 'SqsQueue')
+
     @staticmethod
     def create(credentials):
         return Terminator._create(credentials, LambdaEventSourceMapping, 'lambda', lambda client: client.list_event_source_mappings()['EventSourceMappings'])
@@ -47,6 +49,10 @@ class LambdaLayers(Terminator):
 
 
 class CloudFrontDistribution(Terminator):
+    dependencies = ('CloudFrontCachePolicy', 'CloudFrontOriginAccessIdentity', 'CloudFrontOriginRequestPolicy', 'CloudfrontWafV2WebAcl')
+    global_resource = True
+    record_fields = ('Id',)
+
     @staticmethod
     def create(credentials):
         def list_cloudfront_distributions(client):
@@ -83,6 +89,10 @@ class CloudFrontDistribution(Terminator):
 
 
 class CloudFrontStreamingDistribution(Terminator):
+    dependencies = ('CloudFrontOriginAccessIdentity',)
+    global_resource = True
+    record_fields = ('Id',)
+
     @staticmethod
     def create(credentials):
         def list_cloudfront_streaming_distributions(client):
@@ -120,6 +130,8 @@ class CloudFrontStreamingDistribution(Terminator):
 
 
 class CloudFrontOriginAccessIdentity(DbTerminator):
+    global_resource = True
+
     @staticmethod
     def create(credentials):
         def list_cloud_front_origin_access_identities(client):
@@ -144,6 +156,8 @@ class CloudFrontOriginAccessIdentity(DbTerminator):
 
 
 class CloudFrontCachePolicy(DbTerminator):
+    global_resource = True
+
     @staticmethod
     def create(credentials):
         def list_cloud_front_cache_policies(client):
@@ -175,6 +189,8 @@ class CloudFrontCachePolicy(DbTerminator):
 
 
 class CloudFrontOriginRequestPolicy(DbTerminator):
+    global_resource = True
+
     @staticmethod
     def create(credentials):
         def list_cloud_front_origin_request_policies(client):
@@ -206,6 +222,8 @@ class CloudFrontOriginRequestPolicy(DbTerminator):
 
 
 class Ecs(DbTerminator):
+    dependencies = ('EcsCluster',)
+
     @property
     def age_limit(self):
         return timedelta(minutes=20)
@@ -217,16 +235,12 @@ class Ecs(DbTerminator):
     @staticmethod
     def create(credentials):
         def _paginate_cluster_results(client):
-            names = client.get_paginator('list_clusters').paginate(
-                PaginationConfig={
-                    'PageSize': 100,
-                }
-            ).build_full_result()['clusterArns']
+            names = describe_cache.paginate(client, 'list_clusters', 'clusterArns', PaginationConfig={'PageSize': 100})
 
             if not names:
                 return []
 
-            return client.describe_clusters(clusters=names)['clusters']
+            return describe_cache.call(client, 'describe_clusters', clusters=names)['clusters']
 
         return Terminator._create(credentials, Ecs, 'ecs', _paginate_cluster_results)
 
@@ -316,16 +330,12 @@ class EcsCluster(DbTerminator):
     @staticmethod
     def create(credentials):
         def _paginate_cluster_results(client):
-            names = client.get_paginator('list_clusters').paginate(
-                PaginationConfig={
-                    'PageSize': 100,
-                }
-            ).build_full_result()['clusterArns']
+            names = describe_cache.paginate(client, 'list_clusters', 'clusterArns', PaginationConfig={'PageSize': 100})
 
             if not names:
                 return []
 
-            return client.describe_clusters(clusters=names)['clusters']
+            return describe_cache.call(client, 'describe_clusters', clusters=names)['clusters']
 
         return Terminator._create(credentials, EcsCluster, 'ecs', _paginate_cluster_results)
 
@@ -337,9 +347,7 @@ class BedrockAgent(Terminator):
     @staticmethod
     def create(credentials):
         def _paginate_list_agents(client):
-            agents = client.get_paginator('list_agents').paginate().build_full_result()['agentSummaries']
-
-            return [] if not agents else agents
+            return paginate(client, 'list_agents', 'agentSummaries')
 
         return Terminator._create(credentials, BedrockAgent, 'bedrock-agent', _paginate_list_agents)
 
@@ -354,7 +362,7 @@ class BedrockAgent(Terminator):
 
     @property
     def name(self):
-        return self.instance.get['agentName']
+        return self.instance['agentName']
 
     @property
     def ignore(self) -> bool:
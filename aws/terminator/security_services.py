@@ -3,13 +3,21 @@ import datetime
 import botocore
 import botocore.exceptions
 
-from . import DbTerminator, Terminator
+from . import DbTerminator, Terminator, describe_cache, describe_concurrently, paginate
+
+
+def get_role_details(client):
+    """Return every role in the account with its attached and inline policies and its instance profiles, listed once per sweep."""
+    return describe_cache.paginate(client, 'get_account_authorization_details', 'RoleDetailList', Filter=['Role'])
 
 
 class IamRole(Terminator):
+    global_resource = True
+    record_fields = ('AttachedManagedPolicies', 'RolePolicyList')
+
     @staticmethod
     def create(credentials):
-        return Terminator._create(credentials, IamRole, 'iam', lambda client: client.list_roles()['Roles'])
+        return Terminator._create(credentials, IamRole, 'iam', get_role_details)
 
     @property
     def id(self):
@@ -28,6 +36,12 @@ class IamRole(Terminator):
         return self.instance['CreateDate']
 
     def terminate(self):
+        # the policies of the role are known from its listing, so they are removed up front instead of after a failed delete
+        for policy in self.instance.get('AttachedManagedPolicies', []):
+            self.client.detach_role_policy(RoleName=self.name, PolicyArn=policy['PolicyArn'])
+        for policy in self.instance.get('RolePolicyList', []):
+            self.client.delete_role_policy(RoleName=self.name, PolicyName=policy['PolicyName'])
+
         try:
             self.client.delete_role(RoleName=self.name)
             return
@@ -35,6 +49,7 @@ class IamRole(Terminator):
             if ex.response['Error']['Code'] != 'DeleteConflict':
                 raise
 
+        # policies may have been added since the role was listed
         for policy in self.client.list_attached_role_policies(RoleName=self.name)['AttachedPolicies']:
             self.client.detach_role_policy(RoleName=self.name, PolicyArn=policy['PolicyArn'])
         for policy in self.client.list_role_policies(RoleName=self.name)['PolicyNames']:
@@ -44,9 +59,14 @@ class IamRole(Terminator):
 
 
 class IamInstanceProfile(Terminator):
+    dependencies = ('IamRole',)
+    global_resource = True
+    record_fields = ('Roles',)
+
     @staticmethod
     def create(credentials):
-        return Terminator._create(credentials, IamInstanceProfile, 'iam', lambda client: client.list_instance_profiles()['InstanceProfiles'])
+        # instance profiles without a role are missing from the role details, so they are listed separately
+        return Terminator._create(credentials, IamInstanceProfile, 'iam', lambda client: paginate(client, 'list_instance_profiles', 'InstanceProfiles'))
 
     @property
     def id(self):
@@ -72,6 +92,8 @@ class IamInstanceProfile(Terminator):
 
 
 class IamServerCertificate(Terminator):
+    global_resource = True
+
     @staticmethod
     def create(credentials):
         return Terminator._create(credentials, IamServerCertificate, 'iam', lambda client: client.list_server_certificates()['ServerCertificateMetadataList'])
@@ -104,7 +126,7 @@ class ACMCertificate(DbTerminator):
     def create(credentials):
         return Terminator._create(
             credentials, ACMCertificate, 'acm',
-            lambda client: client.get_paginator('list_certificates').paginate().build_full_result()['CertificateSummaryList']
+            lambda client: paginate(client, 'list_certificates', 'CertificateSummaryList')
         )
 
     @property
@@ -120,6 +142,8 @@ class ACMCertificate(DbTerminator):
 
 
 class IAMSamlProvider(Terminator):
+    global_resource = True
+
     @staticmethod
     def create(credentials):
         return Terminator._create(
@@ -151,24 +175,22 @@ class KMSKey(Terminator):
     @staticmethod
     def create(credentials):
         def get_paginated_keys(client):
-            return client.get_paginator('list_keys').paginate().build_full_result()['Keys']
+            return paginate(client, 'list_keys', 'Keys')
 
-        def get_key_details(client, key):
-            metadata = client.describe_key(KeyId=key['KeyId'])['KeyMetadata']
-            _aliases = client.list_aliases(KeyId=key['KeyId'])['Aliases']
-            aliases = []
-            for alias in _aliases:
-                aliases.append(alias['AliasName'])
-            metadata['Aliases'] = aliases
-            return metadata
+        def get_aliases(client):
+            # a single listing of every alias in the region, instead of a listing per key
+            aliases = {}
+            for alias in paginate(client, 'list_aliases', 'Aliases'):
+                if alias.get('TargetKeyId'):
+                    aliases.setdefault(alias['TargetKeyId'], []).append(alias['AliasName'])
+            return aliases
 
         def get_detailed_keys(client):
-            detailed_keys = []
-            for key in get_paginated_keys(client):
-                metadata = get_key_details(client, key)
-                if metadata:
-                    detailed_keys.append(metadata)
-            return detailed_keys
+            aliases = get_aliases(client)
+            # there is no bulk describe call for keys, so they are described concurrently
+            for metadata in describe_concurrently(lambda key: client.describe_key(KeyId=key['KeyId'])['KeyMetadata'], get_paginated_keys(client)):
+                metadata['Aliases'] = aliases.get(metadata['KeyId'], [])
+                yield metadata
 
         return Terminator._create(credentials, KMSKey, 'kms', get_detailed_keys)
 
@@ -201,9 +223,12 @@ class KMSKey(Terminator):
 
 
 class Secret(Terminator):
+    # the name filter is a case-insensitive prefix match
+    describe_filter = {'Filters': [{'Key': 'name', 'Values': ['ansible-test']}]}
+
     @staticmethod
     def create(credentials):
-        return Terminator._create(credentials, Secret, 'secretsmanager', lambda client: client.list_secrets()['SecretList'])
+        return Terminator._create(credentials, Secret, 'secretsmanager', lambda client, **kwargs: paginate(client, 'list_secrets', 'SecretList', **kwargs))
 
     @property
     def id(self):
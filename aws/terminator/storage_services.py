@@ -1,12 +1,19 @@
+import collections
+import concurrent.futures
 import datetime
 
 import botocore
 import botocore.exceptions
 
-from . import DbTerminator, Terminator, get_account_id
+from . import DbTerminator, TerminationIncomplete, Terminator, clear_state, get_account_id, get_state, set_state
 
 
 class S3Bucket(Terminator):
+    global_resource = True
+
+    # Listing the versions of a large bucket is overlapped with this many concurrent delete_objects requests.
+    delete_jobs = 4
+
     @staticmethod
     def create(credentials):
         return Terminator._create(credentials, S3Bucket, 's3', lambda client: client.list_buckets()['Buckets'])
@@ -26,40 +33,90 @@ class S3Bucket(Terminator):
         return self.instance['CreationDate']
 
     def terminate(self):
-        def _paginated_versions_list(bucket):
-            paginator = self.client.get_paginator("list_object_versions")
-            for page in paginator.paginate(Bucket=bucket):
-                # We have to merge the Versions and DeleteMarker lists here,
-                # as DeleteMarkers can still prevent a bucket deletion
-                yield [
-                    {"Key": data["Key"], "VersionId": data["VersionId"]} for data in (page.get("Versions", []) + page.get("DeleteMarkers", []))
-                ]
-
         try:
             self.client.delete_bucket(Bucket=self.name)
         except botocore.exceptions.ClientError as ex:
             if ex.response['Error']['Code'] == 'NoSuchBucket':
                 return
             if ex.response['Error']['Code'] == 'BucketNotEmpty':
-                for object_versions in _paginated_versions_list(bucket=self.name):
-                    self.client.delete_objects(
-                        Bucket=self.name,
-                        Delete={
-                            "Objects": object_versions,
-                            "Quiet": True,
-                        }
-                    )
+                self._empty()
 
             self.client.delete_bucket(Bucket=self.name)
 
+    def _empty(self):
+        # Resume from the position recorded by an earlier run which did not finish emptying the bucket.
+        cursor_key = f'cursor:S3Bucket:{self.name}'
+        markers = get_state(cursor_key)
+        recorded = bool(markers)
+        pending = collections.deque()
+        stopped = False
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.delete_jobs, thread_name_prefix='s3-delete') as executor:
+            while True:
+                page = self.client.list_object_versions(Bucket=self.name, **markers)
+                # We have to merge the Versions and DeleteMarker lists here,
+                # as DeleteMarkers can still prevent a bucket deletion
+                object_versions = [
+                    {"Key": data["Key"], "VersionId": data["VersionId"]} for data in (page.get("Versions", []) + page.get("DeleteMarkers", []))
+                ]
+                markers = {"KeyMarker": page["NextKeyMarker"], "VersionIdMarker": page["NextVersionIdMarker"]} if page.get("IsTruncated") else {}
+                pending.append((executor.submit(self._delete_objects, object_versions), markers))
+
+                # Near the deadline no more pages are listed, and the deletes already requested are completed so the position recorded is the furthest one.
+                stopped = bool(markers) and self.deadline_reached
+                drain = stopped or not markers
+
+                # Pages are deleted out of order, so the position only moves past a page once it and every page before it are deleted.
+                # Listing is held back when the deletes fall behind, so only a few pages are held in memory.
+                while pending and (pending[0][0].done() or len(pending) > self.delete_jobs * 2 or drain):
+                    future, page_markers = pending.popleft()
+                    future.result()
+
+                    if page_markers:
+                        set_state(cursor_key, page_markers)
+                        recorded = True
+
+                if drain:
+                    break
+
+        if stopped:
+            raise TerminationIncomplete(f'stopped emptying bucket {self.name} due to the deadline, the next run continues from {markers["KeyMarker"]}')
+
+        if recorded:
+            clear_state(cursor_key)
+
+    def _delete_objects(self, object_versions):
+        if object_versions:
+            self.client.delete_objects(
+                Bucket=self.name,
+                Delete={
+                    "Objects": object_versions,
+                    "Quiet": True,
+                }
+            )
+
 
 class SSMBucketObjects(Terminator):
     # We maintain a persistent encrypted bucket for the commmunity.aws SSM connection plugin.
     # Ensure it is kept clean of objects from past test runs.
+    global_resource = True
+
+    # The bucket can hold more objects than a single run can process, so each run lists a limited number of objects,
+    # continuing after the last object listed by the previous run and starting over after reaching the end.
+    cursor_key = 'cursor:SSMBucketObjects'
+    max_items = 10000
+    batch_size = 1000
+
+    # Deleted objects are no longer listed, so there is nothing to skip and no tombstones are kept for them.
+    tombstone_ttl = datetime.timedelta(0)
+
     @staticmethod
     def create(credentials):
         def paginate_objects(client):
-            list_bucket_objects_result = client.get_paginator('list_objects_v2').paginate(Bucket='ssm-encrypted-test-bucket').build_full_result()
+            # The last key listed is recorded instead of a continuation token, since the objects before it may have been deleted since.
+            start_after = get_state(SSMBucketObjects.cursor_key).get('start_after', '')
+            list_bucket_objects_result = client.get_paginator('list_objects_v2').paginate(
+                Bucket='ssm-encrypted-test-bucket', StartAfter=start_after, PaginationConfig={'MaxItems': SSMBucketObjects.max_items}).build_full_result()
             bucket_contents = {}
             if list_bucket_objects_result.get('Contents'):
                 bucket_contents = list_bucket_objects_result['Contents']
@@ -67,6 +124,14 @@ class SSMBucketObjects(Terminator):
 
         return Terminator._create(credentials, SSMBucketObjects, 's3', paginate_objects)
 
+    @classmethod
+    def save_progress(cls, count, last):
+        # A full listing means the end of the bucket may not have been reached, so the next run continues after the last object listed.
+        if count >= cls.max_items:
+            set_state(cls.cursor_key, {'start_after': last.name})
+        elif get_state(cls.cursor_key):
+            clear_state(cls.cursor_key)
+
     @property
     def created_time(self):
         return self.instance['LastModified']
@@ -78,24 +143,35 @@ class SSMBucketObjects(Terminator):
     def terminate(self):
         self.client.delete_object(Bucket='ssm-encrypted-test-bucket', Key=self.name)
 
+    @staticmethod
+    def terminate_batch(instances):
+        objects = {instance.name: instance for instance in instances}
+        result = instances[0].client.delete_objects(Bucket='ssm-encrypted-test-bucket', Delete={
+            'Objects': [{'Key': key} for key in objects],
+            'Quiet': True,
+        })
+        return {objects[error['Key']]: error['Code'] for error in result.get('Errors', [])}
+
 
 class S3AccessPoint(Terminator):
-    _account_id = None
+    __slots__ = ('_account_id',)
+    dependencies = ('S3Bucket',)
+
+    def __init__(self, client, instance):
+        super().__init__(client, instance)
+        self._account_id = None
 
     @staticmethod
     def create(credentials):
         account = get_account_id(credentials)
 
         def list_access_points(client):
-            results = []
             access_points = client.list_access_points(AccountId=account).get("AccessPointList", [])
             for ap in access_points:
-                results.append(client.get_access_point(AccountId=account, Name=ap['Name']))
-            return results
-        terminators = Terminator._create(credentials, S3AccessPoint, 's3control', list_access_points)
-        for terminator in terminators:
+                yield client.get_access_point(AccountId=account, Name=ap['Name'])
+        for terminator in Terminator._create(credentials, S3AccessPoint, 's3control', list_access_points):
             terminator._account_id = account
-        return terminators
+            yield terminator
 
     @property
     def name(self):
@@ -110,22 +186,24 @@ class S3AccessPoint(Terminator):
 
 
 class S3AccessPointForObjectLambda(Terminator):
-    _account_id = None
+    __slots__ = ('_account_id',)
+    dependencies = ('LambdaFunction', 'S3AccessPoint')
+
+    def __init__(self, client, instance):
+        super().__init__(client, instance)
+        self._account_id = None
 
     @staticmethod
     def create(credentials):
         account = get_account_id(credentials)
 
         def list_access_points(client):
-            results = []
             access_points = client.list_access_points_for_object_lambda(AccountId=account).get("ObjectLambdaAccessPointList", [])
             for ap in access_points:
-                results.append(client.get_access_point_for_object_lambda(AccountId=account, Name=ap['Name']))
-            return results
-        terminators = Terminator._create(credentials, S3AccessPointForObjectLambda, 's3control', list_access_points)
-        for terminator in terminators:
+                yield client.get_access_point_for_object_lambda(AccountId=account, Name=ap['Name'])
+        for terminator in Terminator._create(credentials, S3AccessPointForObjectLambda, 's3control', list_access_points):
             terminator._account_id = account
-        return terminators
+            yield terminator
 
     @property
     def name(self):
@@ -140,6 +218,8 @@ class S3AccessPointForObjectLambda(Terminator):
 
 
 class BackupPlan(Terminator):
+    dependencies = ('BackupVault',)
+
     @staticmethod
     def create(credentials):
         def paginate_plans(client):
@@ -192,6 +272,9 @@ class BackupVault(Terminator):
 
 
 class BackupSelection(Terminator):
+    dependencies = ('BackupPlan',)
+    record_fields = ('BackupPlanId',)
+
     @staticmethod
     def create(credentials):
         def _build_backup_selections(client):
@@ -230,6 +313,8 @@ class BackupSelection(Terminator):
 
 
 class MemoryDBClusters(DbTerminator):
+    dependencies = ('Ec2SecurityGroup', 'MemoryDBACLs', 'MemoryDBParameterGroups', 'MemoryDBSubnetGroups')
+
     @staticmethod
     def create(credentials):
         def get_available_clusters(client):
@@ -252,6 +337,8 @@ class MemoryDBClusters(DbTerminator):
 
 
 class MemoryDBACLs(DbTerminator):
+    dependencies = ('MemoryDBUsers',)
+
     @staticmethod
     def create(credentials):
         return Terminator._create(credentials, MemoryDBACLs, 'memorydb', lambda client: client.describe_acls()['ACLs'])
@@ -1,10 +1,13 @@
 import logging
 import os
+import sys
+import time
 
 logging.captureWarnings(True)  # noqa  # capture warnings as early as possible
 
 from terminator import (  # pylint: disable=wrong-import-position
     cleanup,
+    metrics,
 )
 
 
@@ -12,6 +15,8 @@ from terminator import (  # pylint: disable=wrong-import-position
 def lambda_handler(event, context):
     # pylint: disable=unused-argument
 
+    deadline = time.monotonic() + context.get_remaining_time_in_millis() / 1000
+
     arn = context.invoked_function_arn.split(':')
 
     if len(arn) == 7:
@@ -24,5 +29,12 @@ def lambda_handler(event, context):
 
     api_name = os.environ['API_NAME']
     test_account_id = os.environ['TEST_ACCOUNT_ID']
-
-    cleanup(stage, check=False, force=False, api_name=api_name, test_account_id=test_account_id)
+    jobs = int(os.environ.get('JOBS', '1'))
+    regions = [region for region in os.environ.get('REGIONS', '').split(',') if region] or None
+
+    try:
+        cleanup(stage, check=False, force=False, api_name=api_name, test_account_id=test_account_id, jobs=jobs, deadline=deadline,
+                regions=regions)
+    finally:
+        # embedded metric format lines must be written to stdout as-is, rather than through the logger
+        metrics.write_emf(sys.stdout)
@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+"""Benchmark a sweep of a synthetic account, using a local stand-in for AWS and an in-memory key/value store."""
+
+import argparse
+import logging
+import os
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+
+# the stand-in answers every call, but botocore still resolves credentials and a region before making one
+os.environ.update(AWS_ACCESS_KEY_ID='bench', AWS_SECRET_ACCESS_KEY='bench', AWS_DEFAULT_REGION='us-east-1', AWS_EC2_METADATA_DISABLED='true')
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'aws'))
+
+# pylint: disable=wrong-import-position
+import terminator  # noqa: E402
+
+from fake_aws import FakeAws, MemoryTable  # noqa: E402
+
+
+class ErrorCounter(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.ERROR)
+        self.count = 0
+
+    def emit(self, record):
+        self.count += 1
+
+
+def main():
+    args = parse_args()
+
+    console = logging.StreamHandler()
+    console.setLevel(logging.DEBUG if args.verbose else logging.CRITICAL)
+    console.setFormatter(logging.Formatter('%(name)-12s: %(levelname)-8s %(message)s'))
+
+    errors = ErrorCounter()
+
+    terminator.logger.addHandler(console)
+    terminator.logger.addHandler(errors)
+    terminator.logger.setLevel(logging.INFO if args.verbose else logging.WARNING)
+
+    if args.tracemalloc:
+        tracemalloc.start()
+
+    print(f'types={len(args.target or terminator.TERMINATORS)}, resources={args.resources}, latency={args.latency}ms, jitter={args.jitter}ms, '
+          f'regions={",".join(args.region or [terminator.AWS_REGION])}')
+    print(f'{"jobs":>4} {"run":>3} {"wall s":>8} {"api calls":>9} {"kvs calls":>9} {"errors":>6} {"traced MB":>9}')
+
+    for jobs in args.jobs or [1]:
+        walls = []
+
+        for run in range(args.repeat):
+            fake = FakeAws(args.resources, args.latency / 1000, args.jitter / 1000, seed=run)
+            fake.install()
+
+            # every run starts cold, since cached clients would still be attached to the stand-in of an earlier run
+            terminator.invalidate_sessions()
+
+            for store, domain_name in ((terminator.kvs, 'bench-resources-bench'), (terminator.state, 'bench-state-bench')):
+                store.reset(domain_name)
+                MemoryTable(fake).attach(store)
+
+            errors.count = 0
+
+            if args.tracemalloc:
+                tracemalloc.reset_peak()
+
+            start = time.monotonic()
+
+            try:
+                terminator.cleanup('bench', check=args.check, force=False, api_name='bench', test_account_id='123456789012', targets=args.target,
+                                   jobs=jobs, regions=args.region)
+            finally:
+                fake.uninstall()
+
+            wall = time.monotonic() - start
+            walls.append(wall)
+
+            kvs_calls = sum(count for (service, _operation), count in fake.calls.items() if service == 'dynamodb')
+            api_calls = sum(fake.calls.values()) - kvs_calls
+            traced = f'{tracemalloc.get_traced_memory()[1] / 2 ** 20:.1f}' if args.tracemalloc else '-'
+
+            print(f'{jobs:>4} {run:>3} {wall:>8.2f} {api_calls:>9} {kvs_calls:>9} {errors.count:>6} {traced:>9}')
+
+            if args.verbose:
+                for (service, operation), count in fake.calls.most_common(20):
+                    print(f'    {count:>6} {service}.{operation}')
+
+        if args.repeat > 1:
+            print(f'{jobs:>4} {"med":>3} {statistics.median(walls):>8.2f}')
+
+    print(f'peak rss: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MB')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark a sweep of a synthetic account without network access.')
+
+    parser.add_argument('-n', '--resources',
+                        type=int,
+                        default=10,
+                        help='number of resources listed per resource type (default: 10)')
+
+    parser.add_argument('--latency',
+                        type=float,
+                        default=20.0,
+                        help='mean latency of each API call in milliseconds (default: 20)')
+
+    parser.add_argument('--jitter',
+                        type=float,
+                        default=5.0,
+                        help='standard deviation of the latency in milliseconds (default: 5)')
+
+    parser.add_argument('-j', '--jobs',
+                        type=int,
+                        action='append',
+                        help='number of jobs to benchmark, may be repeated to compare (default: 1)')
+
+    parser.add_argument('--region',
+                        metavar='region',
+                        action='append',
+                        help='region to sweep, may be repeated')
+
+    parser.add_argument('--repeat',
+                        type=int,
+                        default=1,
+                        help='number of runs for each number of jobs')
+
+    parser.add_argument('--target',
+                        choices=sorted(terminator.TERMINATORS),
+                        metavar='target',
+                        action='append',
+                        help='class to run')
+
+    parser.add_argument('-c', '--check',
+                        action='store_true',
+                        help='do not terminate resources')
+
+    parser.add_argument('--tracemalloc',
+                        action='store_true',
+                        help='report the peak memory allocated by each run, which slows down the runs')
+
+    parser.add_argument('-v', '--verbose',
+                        action='store_true',
+                        help='log the sweep and list the most frequent API calls of each run')
+
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    main()
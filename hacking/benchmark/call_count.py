@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+"""Benchmark how the number of API calls made to discover each terminator type scales with the number of resources in the account."""
+
+import argparse
+import os
+import sys
+import time
+import typing
+
+# the stand-in answers every call, but botocore still resolves credentials and a region before making one
+os.environ.update(AWS_ACCESS_KEY_ID='bench', AWS_SECRET_ACCESS_KEY='bench', AWS_DEFAULT_REGION='us-east-1', AWS_EC2_METADATA_DISABLED='true')
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'aws'))
+
+# pylint: disable=wrong-import-position
+import terminator  # noqa: E402
+
+from fake_aws import FakeAws, MemoryTable  # noqa: E402
+
+# types whose discovery makes further calls for each resource listed
+DEFAULT_TARGETS = ('EksCluster', 'EksFargateProfile', 'EksNodegroup', 'KMSKey', 'KinesisStream')
+
+
+def main():
+    args = parse_args()
+    targets = args.target or DEFAULT_TARGETS
+    counts = args.resources or [1, 10, 100]
+
+    print(f'latency={args.latency}ms, cells show the API calls made by the service of the type and the wall time in seconds')
+    print(f'{"type":<24} ' + ' '.join(f'{f"n={count}":>16}' for count in counts))
+
+    for target in targets:
+        results = [count_calls(target, count, args.latency / 1000) for count in counts]
+        print(f'{target:<24} ' + ' '.join(f'{f"{calls} ({wall:.2f}s)":>16}' for calls, wall in results))
+
+
+def count_calls(target: str, resources: int, latency: float) -> typing.Tuple[int, float]:
+    """Return the number of calls made to the service of the given type by a check mode sweep of it, along with the wall time of the sweep."""
+    fake = FakeAws(resources, latency)
+    fake.install()
+
+    # cached clients would still be attached to the stand-in of an earlier run
+    terminator.invalidate_sessions()
+
+    for store, domain_name in ((terminator.kvs, 'bench-resources-bench'), (terminator.state, 'bench-state-bench')):
+        store.reset(domain_name)
+        MemoryTable(fake).attach(store)
+
+    start = time.monotonic()
+
+    try:
+        terminator.cleanup('bench', check=True, force=False, api_name='bench', test_account_id='123456789012', targets=[target])
+    finally:
+        fake.uninstall()
+
+    wall = time.monotonic() - start
+
+    # calls made by every sweep, such as those for the key/value store and the account details, are left out
+    service = terminator.TERMINATORS[target]['service']
+
+    return sum(count for (call_service, _operation), count in fake.calls.items() if call_service == service), wall
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark the number of API calls made to discover resources, without network access.')
+
+    parser.add_argument('-n', '--resources',
+                        type=int,
+                        action='append',
+                        help='number of resources listed per resource type, may be repeated (default: 1, 10 and 100)')
+
+    parser.add_argument('--latency',
+                        type=float,
+                        default=0.0,
+                        help='latency of each API call in milliseconds, to compare wall times (default: 0)')
+
+    parser.add_argument('--target',
+                        choices=sorted(terminator.TERMINATORS),
+                        metavar='target',
+                        action='append',
+                        help='class to count, may be repeated (default: the types which describe each resource listed)')
+
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,257 @@
+"""Local stand-in for the AWS APIs used by the terminator, for benchmarking without network access or an AWS account."""
+
+import collections
+import datetime
+import functools
+import json
+import random
+import threading
+import time
+import types
+import typing
+import zlib
+
+import botocore.awsrequest
+import botocore.exceptions
+import botocore.model
+import botocore.session
+import botocore.waiter
+import dateutil.tz
+
+SCALAR_VALUES = {
+    'blob': b'',
+    'boolean': False,
+    'double': 1.0,
+    'float': 1.0,
+    'integer': 1,
+    'long': 1,
+}
+
+
+class FakeAws:
+    """Answer every API call of every botocore client with a synthetic response, generated from the output shape of the operation.
+
+    Each list in the output of an operation holds the configured number of resources, and a list nested within them holds one item.
+    Timestamps are a day old, so every resource found is stale and will be terminated.
+    """
+    max_depth = 6
+
+    def __init__(self, resources: int, latency: float = 0.0, jitter: float = 0.0, seed: int = 0):
+        self.resources = resources
+        self.latency = latency
+        self.jitter = jitter
+        self.calls: typing.Counter[typing.Tuple[str, str]] = collections.Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._originals: typing.Optional[typing.Tuple[typing.Any, typing.Any]] = None
+
+    def install(self) -> None:
+        """Attach the stand-in to every botocore client created from now on."""
+        fake = self
+        original_create_client = botocore.session.Session.create_client
+        self._originals = (original_create_client, botocore.waiter.Waiter.wait)
+
+        def create_client(session, *args, **kwargs):
+            client = original_create_client(session, *args, **kwargs)
+            # registered last, so hooks added to pooled clients afterwards still see each call before it is answered
+            client.meta.events.register_last('before-call', fake.before_call)
+            return client
+
+        botocore.session.Session.create_client = create_client
+        # synthetic resources never reach the state a waiter expects
+        botocore.waiter.Waiter.wait = lambda waiter, **kwargs: None
+
+    def uninstall(self) -> None:
+        botocore.session.Session.create_client, botocore.waiter.Waiter.wait = self._originals
+
+    def before_call(self, model: botocore.model.OperationModel, **_kwargs) -> typing.Tuple[botocore.awsrequest.AWSResponse, typing.Dict[str, typing.Any]]:
+        self.sleep()
+
+        with self._lock:
+            self.calls[(model.service_model.service_name, model.name)] += 1
+
+        parsed = self.generate(model.output_shape, 0, 0) if model.output_shape else {}
+
+        # output members which continue a listing are left empty, so every listing is a single page
+        for path in get_pagination_members(model.service_model.service_name, model.service_model.api_version, model.name):
+            parent = parsed
+
+            for member_name in path[:-1]:
+                parent = parent.get(member_name, {})
+
+            parent.pop(path[-1], None)
+
+        parsed['ResponseMetadata'] = {'HTTPStatusCode': 200, 'HTTPHeaders': {}, 'RetryAttempts': 0}
+
+        body = json.dumps(parsed, default=str).encode()
+        http_response = botocore.awsrequest.AWSResponse('https://localhost/', 200, {'content-length': str(len(body))}, None)
+        http_response._content = body  # pylint: disable=protected-access
+
+        return http_response, parsed
+
+    def sleep(self) -> None:
+        if self.latency or self.jitter:
+            with self._lock:
+                delay = max(0.0, self._random.gauss(self.latency, self.jitter))
+
+            time.sleep(delay)
+
+    def generate(self, shape: botocore.model.Shape, depth: int, index: int, name: str = '') -> typing.Any:
+        generator = getattr(self, f'_generate_{shape.type_name}', None)
+
+        if generator:
+            return generator(shape, depth, index, name)
+
+        return SCALAR_VALUES.get(shape.type_name)
+
+    def _generate_structure(self, shape: botocore.model.StructureShape, depth: int, index: int, _name: str) -> typing.Dict[str, typing.Any]:
+        if depth > self.max_depth:
+            return {}
+
+        return {member_name: self.generate(member_shape, depth + 1, index, member_name) for member_name, member_shape in shape.members.items()}
+
+    def _generate_list(self, shape: botocore.model.ListShape, depth: int, index: int, name: str) -> typing.List[typing.Any]:
+        count = self.resources if depth == 1 else 1 if depth <= self.max_depth else 0
+        return [self.generate(shape.member, depth + 1, item if depth == 1 else index, name) for item in range(count)]
+
+    @staticmethod
+    def _generate_map(_shape: botocore.model.MapShape, _depth: int, _index: int, _name: str) -> typing.Dict[str, typing.Any]:
+        return {}
+
+    @staticmethod
+    def _generate_string(shape: botocore.model.StringShape, _depth: int, index: int, name: str) -> str:
+        if shape.enum:
+            return shape.enum[0]
+
+        if name.lower().endswith('arn'):
+            return f'arn:aws:bench:us-east-1:123456789012:bench/{name}-{index}'
+
+        return f'bench-{name}-{index}'
+
+    @staticmethod
+    def _generate_timestamp(_shape: botocore.model.Shape, _depth: int, _index: int, name: str) -> datetime.datetime:
+        now = datetime.datetime.now(tz=dateutil.tz.tzutc())
+
+        # credentials from the stand-in for AssumeRole must not be expired already
+        if name == 'Expiration':
+            return now + datetime.timedelta(days=1)
+
+        return now - datetime.timedelta(days=1)
+
+
+@functools.lru_cache(maxsize=None)
+def get_pagination_members(service_name: str, api_version: str, operation_name: str) -> typing.FrozenSet[typing.Tuple[str, ...]]:
+    """Return the paths of the output members which botocore uses to continue a listing of the given operation, according to its paginator model."""
+    try:
+        config = botocore.session.get_session().get_paginator_model(service_name, api_version).get_paginator(operation_name)
+    except (botocore.exceptions.DataNotFoundError, ValueError):
+        return frozenset()
+
+    tokens = list(config['output_token']) if isinstance(config['output_token'], list) else [config['output_token']]
+
+    if 'more_results' in config:
+        tokens.append(config['more_results'])
+
+    members = set()
+
+    for token in tokens:
+        for expression in token.split('||'):
+            expression = expression.strip()
+
+            # a token taken from the results, such as the key of the last object listed, stops once the results are empty
+            if '[' not in expression:
+                members.add(tuple(expression.split('.')))
+
+    return frozenset(members)
+
+
+class MemoryTable:
+    """In-memory stand-in for the DynamoDB table of a KeyValueStore, supporting the requests the store makes."""
+    page_size = 1000
+
+    def __init__(self, fake: FakeAws, primary_key: str = 'id'):
+        self.fake = fake
+        self.primary_key = primary_key
+        self.items: typing.Dict[str, typing.Dict[str, typing.Any]] = {}
+        self.meta = types.SimpleNamespace(client=self)
+        self._lock = threading.Lock()
+
+    def attach(self, store: typing.Any) -> None:
+        """Use this table for the given KeyValueStore, skipping the creation of a DynamoDB table."""
+        store.table = self
+
+    def _call(self, operation_name: str) -> None:
+        self.fake.sleep()
+
+        with self.fake._lock:  # pylint: disable=protected-access
+            self.fake.calls[('dynamodb', operation_name)] += 1
+
+    def scan(self, TableName: str, Segment: int = 0, TotalSegments: int = 1, ExclusiveStartKey: typing.Optional[typing.Dict[str, str]] = None,
+             FilterExpression: typing.Any = None, **_kwargs) -> typing.Dict[str, typing.Any]:
+        self._call('Scan')
+
+        with self._lock:
+            keys = sorted(key for key in self.items if zlib.crc32(key.encode()) % TotalSegments == Segment)
+
+            if ExclusiveStartKey:
+                keys = [key for key in keys if key > ExclusiveStartKey[self.primary_key]]
+
+            page = [dict(self.items[key]) for key in keys[:self.page_size]]
+
+        if FilterExpression is not None:
+            page = [item for item in page if self._matches(FilterExpression, item)]
+
+        result: typing.Dict[str, typing.Any] = {'Items': page}
+
+        if len(keys) > self.page_size:
+            result['LastEvaluatedKey'] = {self.primary_key: keys[self.page_size - 1]}
+
+        return result
+
+    @staticmethod
+    def _matches(condition: typing.Any, item: typing.Dict[str, typing.Any]) -> bool:
+        expression = condition.get_expression()
+        attribute, value = expression['values']
+
+        if expression['operator'] == '<':
+            return attribute.name in item and item[attribute.name] < value
+
+        if expression['operator'] == 'begins_with':
+            return attribute.name in item and item[attribute.name].startswith(value)
+
+        raise NotImplementedError(f'unsupported filter expression: {expression["format"]}')
+
+    def batch_write_item(self, RequestItems: typing.Dict[str, typing.List[typing.Dict[str, typing.Any]]]) -> typing.Dict[str, typing.Any]:
+        self._call('BatchWriteItem')
+
+        with self._lock:
+            for requests in RequestItems.values():
+                for request in requests:
+                    if 'PutRequest' in request:
+                        item = request['PutRequest']['Item']
+                        self.items[item[self.primary_key]] = dict(item)
+                    else:
+                        self.items.pop(request['DeleteRequest']['Key'][self.primary_key], None)
+
+        return {'UnprocessedItems': {}}
+
+    def get_item(self, Key: typing.Dict[str, str], **_kwargs) -> typing.Dict[str, typing.Any]:
+        self._call('GetItem')
+
+        with self._lock:
+            item = self.items.get(Key[self.primary_key])
+
+        return {'Item': dict(item)} if item else {}
+
+    def put_item(self, Item: typing.Dict[str, typing.Any], ConditionExpression: typing.Any = None, **_kwargs) -> typing.Dict[str, typing.Any]:
+        self._call('PutItem')
+
+        with self._lock:
+            # the store only uses a condition to avoid replacing an existing item
+            if ConditionExpression is not None and Item[self.primary_key] in self.items:
+                raise botocore.exceptions.ClientError({'Error': {'Code': 'ConditionalCheckFailedException', 'Message': 'The conditional request failed'}},
+                                                      'PutItem')
+
+            self.items[Item[self.primary_key]] = dict(Item)
+
+        return {}
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+"""Benchmark the time taken to import the terminator package and the plugin modules needed by a run."""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+AWS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'aws')
+
+SCENARIOS = {
+    'package only': 'import terminator',
+    'single target (Ec2Instance)': 'import terminator; terminator.get_terminator_types(["Ec2Instance"])',
+    'single module (storage_services)': 'import terminator; terminator.get_terminator_types(['
+                                        'name for name, entry in terminator.TERMINATORS.items() if entry["module"] == "storage_services"])',
+    'every type, as before the index': 'import terminator; terminator.get_terminator_types()',
+}
+
+# each scenario runs in a fresh interpreter, so nothing is imported already
+TIMER = '''\
+import time
+start = time.perf_counter()
+{code}
+print(time.perf_counter() - start)
+'''
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the import time of the terminator package.')
+
+    parser.add_argument('--repeat',
+                        type=int,
+                        default=10,
+                        help='number of runs of each scenario (default: 10)')
+
+    args = parser.parse_args()
+
+    # the boto3 and botocore imports are shared by every scenario, so they are measured separately
+    baseline = measure('import boto3, boto3.dynamodb.conditions, botocore.config, dateutil.tz', args.repeat)
+    print(f'{"scenario":<40} {"median ms":>10} {"min ms":>8} {"excl. boto3 ms":>15}')
+    print(f'{"boto3 and botocore":<40} {statistics.median(baseline) * 1000:>10.1f} {min(baseline) * 1000:>8.1f}')
+
+    for name, code in SCENARIOS.items():
+        times = measure(code, args.repeat)
+        print(f'{name:<40} {statistics.median(times) * 1000:>10.1f} {min(times) * 1000:>8.1f} '
+              f'{(statistics.median(times) - statistics.median(baseline)) * 1000:>15.1f}')
+
+
+def measure(code, repeat):
+    return [float(subprocess.run([sys.executable, '-c', TIMER.format(code=code)], cwd=AWS_PATH, check=True, capture_output=True, text=True).stdout)
+            for _ in range(repeat)]
+
+
+if __name__ == '__main__':
+    main()